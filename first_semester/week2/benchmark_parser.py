@@ -0,0 +1,80 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from main import compile_keywords, load_keywords, read_log_records, tag_problems
+from mmap_parser import compile_bytes_pattern, iter_problems_mmap
+
+NORMAL_MESSAGES = (
+    'Rocket initialization process started.',
+    'Power systems online. Batteries at optimal charge.',
+    'Communication established with mission control.',
+    'Navigation systems show nominal performance.',
+    'Second stage burn nominal. Rocket velocity increasing.',
+)
+PROBLEM_MESSAGES = (
+    'Oxygen tank unstable.',
+    'Oxygen tank explosion.',
+    'Center and mission control systems powered down.',
+)
+
+
+def generate_log(path, size_mb, problem_ratio=0.01):
+    '''size_mb 크기의 합성 미션 로그를 생성'''
+    target = size_mb * 1024 * 1024
+    rng = random.Random(0)
+    with open(path, 'w', encoding='utf-8', buffering=1024 * 1024) as log_file:
+        written = log_file.write('timestamp,event,message\n')
+        second = 0
+        while written < target:
+            lines = []
+            for _ in range(10000):
+                second += 1
+                hours, rest = divmod(second, 3600)
+                timestamp = f'2023-08-{27 + hours // 24 % 2} {hours % 24:02d}:{rest // 60:02d}:{rest % 60:02d}'
+                messages = PROBLEM_MESSAGES if rng.random() < problem_ratio else NORMAL_MESSAGES
+                lines.append(f'{timestamp},INFO,{rng.choice(messages)}\n')
+            written += log_file.write(''.join(lines))
+
+
+def bench(label, size_bytes, func):
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<24} {count:>10}건  {elapsed:8.2f}초  {size_bytes / 1024 / 1024 / elapsed:10.1f} MB/s')
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='기존 줄 단위 파서와 mmap 파서의 문제 로그 추출 속도를 비교합니다.')
+    parser.add_argument('--size-mb', type=int, default=1024, help='합성 로그 크기(MB) (기본값: %(default)s)')
+    parser.add_argument('--log', default=None, help='합성 로그 대신 사용할 로그 파일')
+    args = parser.parse_args()
+
+    pattern = compile_keywords(load_keywords())
+    bytes_pattern = compile_bytes_pattern(pattern)
+
+    with tempfile.TemporaryDirectory(prefix='log_bench_') as tmp_dir:
+        log_path = args.log
+        if log_path is None:
+            log_path = os.path.join(tmp_dir, 'synthetic.log')
+            print(f'{args.size_mb}MB 합성 로그를 생성하는 중...')
+            generate_log(log_path, args.size_mb)
+        size_bytes = os.path.getsize(log_path)
+
+        line_count = bench(
+            'readline + split', size_bytes,
+            lambda: sum(1 for record in tag_problems(read_log_records(log_path), pattern) if record[3])
+        )
+        mmap_count = bench(
+            'mmap + memoryview', size_bytes,
+            lambda: sum(1 for _ in iter_problems_mmap(log_path, bytes_pattern))
+        )
+        if line_count != mmap_count:
+            print('경고: 두 파서의 결과 건수가 다릅니다.')
+
+
+if __name__ == '__main__':
+    main()
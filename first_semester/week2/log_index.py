@@ -0,0 +1,179 @@
+import bisect
+import calendar
+import mmap
+import os
+import struct
+import time
+from array import array
+
+INDEX_MAGIC = b'MLOGIDX1'
+# 헤더: 매직, 로그 파일 inode, 색인한 로그 크기(바이트), 레코드 수
+HEADER = struct.Struct('<8sQQQ')
+# 레코드: epoch 초(int64), 로그 파일 내 줄 시작 offset(int64)
+RECORD_SIZE = 16
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def to_epoch(timestamp):
+    '''로그 timestamp 문자열을 epoch 초로 변환 (로그 시간은 UTC로 간주)'''
+    return calendar.timegm(time.strptime(timestamp, TIMESTAMP_FORMAT))
+
+
+def default_index_path(log_path):
+    return log_path + '.idx'
+
+
+def _scan_entries(log_path, offset):
+    '''offset 이후의 완전한 줄마다 (epoch, 줄 시작 offset)을 만들고 마지막으로 읽은 위치를 반환'''
+    entries = []
+    with open(log_path, 'rb') as log_file:
+        log_file.seek(offset)
+        for raw_line in log_file:
+            if not raw_line.endswith(b'\n'):
+                break
+            line_offset = offset
+            offset += len(raw_line)
+            if line_offset == 0 or raw_line == b'\n':
+                continue  # 헤더 또는 빈 줄
+            timestamp = raw_line.split(b',', 1)[0].decode('utf-8')
+            entries.append((to_epoch(timestamp), line_offset))
+    return entries, offset
+
+
+def _read_header(index_path):
+    try:
+        with open(index_path, 'rb') as index_file:
+            header = index_file.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) != HEADER.size:
+        return None
+    magic, inode, indexed_size, count = HEADER.unpack(header)
+    if magic != INDEX_MAGIC or os.path.getsize(index_path) != HEADER.size + count * RECORD_SIZE:
+        return None
+    return inode, indexed_size, count
+
+
+def _pack(entries):
+    packed = array('q')
+    for epoch, offset in entries:
+        packed.append(epoch)
+        packed.append(offset)
+    return packed.tobytes()
+
+
+def _write_index(index_path, inode, indexed_size, entries):
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as index_file:
+        index_file.write(HEADER.pack(INDEX_MAGIC, inode, indexed_size, len(entries)))
+        index_file.write(_pack(entries))
+    os.replace(tmp_path, index_path)
+
+
+def build_index(log_path, index_path=None):
+    '''
+    로그 파일의 timestamp 색인을 만들거나 갱신하고 색인 파일 경로를 반환
+    로그가 뒤에 덧붙여지기만 했다면 새로 추가된 줄만 읽어 색인에 추가하고,
+    로그 파일이 교체되었거나 잘렸다면 처음부터 다시 만든다.
+    '''
+    index_path = index_path or default_index_path(log_path)
+    stat = os.stat(log_path)
+    header = _read_header(index_path)
+
+    if header is None or header[0] != stat.st_ino or header[1] > stat.st_size:
+        entries, indexed_size = _scan_entries(log_path, 0)
+        entries.sort()
+        _write_index(index_path, stat.st_ino, indexed_size, entries)
+        return index_path
+
+    inode, indexed_size, count = header
+    if indexed_size == stat.st_size:
+        return index_path
+
+    new_entries, new_size = _scan_entries(log_path, indexed_size)
+    new_entries.sort()
+    with LogIndex(index_path) as index:
+        last_epoch = index.epoch(count - 1) if count else None
+        if new_entries and last_epoch is not None and new_entries[0][0] < last_epoch:
+            # 시간 순서가 뒤섞인 로그가 추가되면 기존 색인과 병합해서 다시 쓴다.
+            old_entries = [(index.epoch(i), index.offset(i)) for i in range(count)]
+            merged = sorted(old_entries + new_entries)
+        else:
+            merged = None
+
+    if merged is not None:
+        _write_index(index_path, inode, new_size, merged)
+    else:
+        # 대부분의 경우: 새 레코드를 뒤에 붙이고 헤더만 갱신
+        with open(index_path, 'r+b') as index_file:
+            index_file.seek(0, os.SEEK_END)
+            index_file.write(_pack(new_entries))
+            index_file.seek(0)
+            index_file.write(HEADER.pack(INDEX_MAGIC, inode, new_size, count + len(new_entries)))
+    return index_path
+
+
+class _EpochView:
+    '''bisect가 색인의 epoch 열을 정렬된 시퀀스처럼 탐색할 수 있게 해주는 뷰'''
+
+    def __init__(self, records):
+        self.records = records
+
+    def __len__(self):
+        return len(self.records) // 2
+
+    def __getitem__(self, i):
+        return self.records[2 * i]
+
+
+class LogIndex:
+    '''메모리 맵으로 연 timestamp 색인, 구간 검색은 이진 탐색으로 처리'''
+
+    def __init__(self, index_path):
+        self.index_file = open(index_path, 'rb')
+        self.mm = mmap.mmap(self.index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.records = memoryview(self.mm)[HEADER.size:].cast('q')
+        self.epochs = _EpochView(self.records)
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.epochs = None
+        self.records.release()
+        self.mm.close()
+        self.index_file.close()
+
+    def epoch(self, i):
+        return self.records[2 * i]
+
+    def offset(self, i):
+        return self.records[2 * i + 1]
+
+    def find_range(self, start_epoch=None, end_epoch=None):
+        '''start_epoch <= epoch <= end_epoch 인 레코드의 [lo, hi) 구간을 반환'''
+        lo = 0 if start_epoch is None else bisect.bisect_left(self.epochs, start_epoch)
+        hi = len(self) if end_epoch is None else bisect.bisect_right(self.epochs, end_epoch)
+        return lo, max(lo, hi)
+
+
+def query_log(log_path, start_epoch=None, end_epoch=None, event=None, index_path=None):
+    '''
+    색인으로 시간 구간에 해당하는 로그만 찾아 읽는 제너레이터
+    (timestamp, event, message)를 시간의 역순으로 돌려준다.
+    '''
+    index_path = build_index(log_path, index_path)
+    with LogIndex(index_path) as index, open(log_path, 'rb') as log_file:
+        lo, hi = index.find_range(start_epoch, end_epoch)
+        for i in range(hi - 1, lo - 1, -1):
+            log_file.seek(index.offset(i))
+            line = log_file.readline().decode('utf-8').rstrip('\n')
+            timestamp, line_event, message = line.split(',', 2)
+            if event is None or line_event == event:
+                yield timestamp, line_event, message
@@ -1,41 +1,446 @@
-print('Hello Mars')
+import argparse
+import csv
+import glob
+import heapq
+import json
+import mmap
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-try:
-    with open('./mission_computer_main.log', 'r') as log_file:
-        log_content = log_file.readlines()
+from log_index import query_log, to_epoch
+from mmap_parser import compile_bytes_pattern, scan_problems
 
-    # 로그를 역순으로 정렬한 것을 보고서 형식으로 작성
-    sorted_log_content = sorted(log_content[1:], key=lambda x: x.split(',')[0], reverse=True)
+LOG_PATH = './mission_computer_main.log'
+REPORT_PATH = './log_analysis.md'
+PROBLEM_REPORT_PATH = './problematic_log_entries.md'
+STATE_PATH = './.log_analysis_state.json'  # --follow 모드에서 마지막 처리 위치 저장
+PROBLEM_KEYWORDS_PATH = './problem_keywords.txt'
+PROBLEM_KEYWORDS = ('unstable', 'explosion', 'powered down')  # 키워드 파일이 없을 때 사용
 
-    markdown_content = '# Log Analysis Report\n\n'
-    markdown_content += '### Log Entries\n\n'
-    markdown_content += '| Timestamp | Event | Message |\n'
-    markdown_content += '| --- | --- | --- |\n'
+CHUNK_SIZE = 100000  # 스필 파일 하나에 담을 최대 로그 줄 수
+MERGE_FAN_IN = 32  # 한 번에 병합할 최대 런 파일 수 (열린 파일 수 제한에 여유를 두기 위해 작게 유지)
+WRITE_BUFFER_SIZE = 1024 * 1024  # 보고서 쓰기 버퍼 크기(바이트)
+FOLLOW_INTERVAL = 1.0  # --follow 모드에서 새 로그를 확인하는 간격(초)
 
-    problematic_markdown_content = '# Problematic Log Entries\n\n'
-    problematic_markdown_content += '| Timestamp | Event | Message |\n'
-    problematic_markdown_content += '| --- | --- | --- |\n'
 
-    for line in sorted_log_content:
-        timestamp, event, message = line.strip().split(',')
-        markdown_content += f"| {timestamp} | {event} | {message} |\n"
+def read_log_records(path):
+    '''로그 파일을 한 줄씩 읽어 (timestamp, event, message) 튜플을 돌려주는 제너레이터'''
+    with open(path, 'r', encoding='utf-8') as log_file:
+        next(log_file, None)  # 헤더(timestamp,event,message) 건너뛰기
+        for line in log_file:
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            timestamp, event, message = line.split(',', 2)
+            yield timestamp, event, message
 
-        # 문제가 되는 키워드를 저장
-        if 'unstable' in message or 'explosion' in message or 'powered down' in message:
-            problematic_markdown_content += f'| {timestamp} | {event} | {message} |\n'
 
-    # 전체 보고서 저장
-    with open('./log_analysis.md', 'w') as markdown_file:
-        markdown_file.write(markdown_content)
+def record_key(record):
+    return record[0]
 
-    # 문제가 되는 부분 따로 저장
-    with open('./problematic_log_entries.md', 'w') as problematic_file:
-        problematic_file.write(problematic_markdown_content)
 
-    print('로그 내용을 시간의 역순으로 Markdown 형식으로 성공적으로 변환하고 저장했습니다.')
-    print(f'문제가 되는 로그 엔트리 파일을 저장했습니다.')
+def load_keywords(path=None):
+    '''
+    키워드 파일에서 문제 키워드 목록을 읽음 (한 줄에 하나, #으로 시작하면 주석)
+    path를 지정하지 않았고 기본 키워드 파일도 없으면 PROBLEM_KEYWORDS를 사용
+    '''
+    if path is None:
+        if not os.path.exists(PROBLEM_KEYWORDS_PATH):
+            return list(PROBLEM_KEYWORDS)
+        path = PROBLEM_KEYWORDS_PATH
+    with open(path, 'r', encoding='utf-8') as keyword_file:
+        keywords = (line.strip() for line in keyword_file)
+        return [keyword for keyword in keywords if keyword and not keyword.startswith('#')]
 
-except FileNotFoundError:
-    print('오류: 파일을 찾을 수 없습니다.')
-except Exception as e:
-    print(f'예상치 못한 오류가 발생했습니다: {e}')
+
+def compile_keywords(keywords):
+    '''
+    키워드 목록을 하나의 정규식으로 컴파일해서 한 줄을 한 번만 훑어 모든 키워드를 검사
+    겹치는 키워드는 더 긴 것이 먼저 매칭되도록 길이 역순으로 정렬
+    '''
+    unique_keywords = sorted(set(keywords), key=lambda keyword: (-len(keyword), keyword))
+    if not unique_keywords:
+        return re.compile(r'(?!)')  # 아무것도 매칭하지 않는 패턴
+    return re.compile('|'.join(re.escape(keyword) for keyword in unique_keywords))
+
+
+def find_problem_keyword(message, pattern):
+    '''메시지에서 처음 매칭된 문제 키워드를 반환, 없으면 빈 문자열'''
+    match = pattern.search(message)
+    return match.group(0) if match else ''
+
+
+def count_keyword_hits(keyword_hits, message, pattern):
+    '''
+    메시지에 들어 있는 모든 문제 키워드를 keyword_hits에 더함
+    한 메시지에 여러 키워드가 있으면 각각 한 번씩 센다 (같은 키워드가 여러 번 나와도 한 번).
+    '''
+    keyword_hits.update({match.group(0) for match in pattern.finditer(message)})
+
+
+def tag_problems(records, pattern):
+    '''레코드 끝에 매칭된 문제 키워드(없으면 '')를 붙여서 돌려주는 제너레이터'''
+    for timestamp, event, message in records:
+        yield timestamp, event, message, find_problem_keyword(message, pattern)
+
+
+def _write_spill(records, tmp_dir):
+    '''정렬된 레코드 묶음을 임시 스필 파일로 저장하고 경로를 반환'''
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE) as spill_file:
+        csv.writer(spill_file).writerows(records)
+    return path
+
+
+def _read_spill(path):
+    with open(path, 'r', encoding='utf-8', newline='') as spill_file:
+        for row in csv.reader(spill_file):
+            yield tuple(row)
+
+
+def merge_runs(run_paths, tmp_dir, fan_in=MERGE_FAN_IN):
+    '''
+    timestamp 역순으로 정렬된 런 파일들을 하나의 정렬된 레코드 흐름으로 병합
+    런이 fan_in개보다 많으면 fan_in개씩 묶어 중간 런 파일로 병합하는 단계를 반복하므로
+    동시에 여는 파일 수가 fan_in개를 넘지 않는다. 병합한 런 파일은 바로 지운다.
+    '''
+    while len(run_paths) > fan_in:
+        merged_paths = []
+        for start in range(0, len(run_paths), fan_in):
+            group = run_paths[start:start + fan_in]
+            if len(group) == 1:
+                merged_paths.append(group[0])
+                continue
+            runs = [_read_spill(path) for path in group]
+            # 인접한 런끼리 순서대로 묶으므로 같은 timestamp의 원래 순서가 유지된다.
+            merged_paths.append(_write_spill(heapq.merge(*runs, key=record_key, reverse=True), tmp_dir))
+            for path in group:
+                os.remove(path)
+        run_paths = merged_paths
+    runs = [_read_spill(path) for path in run_paths]
+    return heapq.merge(*runs, key=record_key, reverse=True)
+
+
+def sort_records_desc(records, tmp_dir, chunk_size=CHUNK_SIZE):
+    '''
+    레코드를 timestamp 역순으로 정렬하는 외부 병합 정렬
+    chunk_size 단위로 정렬해 스필 파일에 쓰고, merge_runs로 합친다.
+    입력이 한 묶음에 들어가면 스필 없이 메모리에서 정렬한다.
+    '''
+    spill_paths = []
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            chunk.sort(key=record_key, reverse=True)
+            spill_paths.append(_write_spill(chunk, tmp_dir))
+            chunk = []
+
+    chunk.sort(key=record_key, reverse=True)
+    if not spill_paths:
+        return iter(chunk)
+
+    spill_paths.append(_write_spill(chunk, tmp_dir))
+    del chunk
+    # 정렬이 안정적이므로 같은 timestamp는 원래 순서를 유지한다.
+    return merge_runs(spill_paths, tmp_dir)
+
+
+def write_reports(sorted_records, pattern, report_path=REPORT_PATH, problem_report_path=PROBLEM_REPORT_PATH):
+    '''
+    정렬된 레코드를 받아 두 Markdown 보고서를 버퍼 단위로 바로 기록
+    Keyword 열에는 처음 매칭된 키워드를 쓰고, 키워드별 횟수는 pattern으로 메시지의 모든 키워드를 센다.
+    '''
+    with open(report_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as markdown_file, \
+            open(problem_report_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as problematic_file:
+        markdown_file.write('# Log Analysis Report\n\n')
+        markdown_file.write('### Log Entries\n\n')
+        markdown_file.write('| Timestamp | Event | Message |\n')
+        markdown_file.write('| --- | --- | --- |\n')
+
+        write_problem_header(problematic_file)
+
+        keyword_hits = Counter()
+        for timestamp, event, message, keyword in sorted_records:
+            markdown_file.write(f'| {timestamp} | {event} | {message} |\n')
+
+            # 문제가 되는 키워드를 저장
+            if keyword:
+                count_keyword_hits(keyword_hits, message, pattern)
+                problematic_file.write(f'| {timestamp} | {event} | {message} | {keyword} |\n')
+
+        write_keyword_hits(problematic_file, keyword_hits)
+
+
+def write_problem_header(problematic_file):
+    problematic_file.write('# Problematic Log Entries\n\n')
+    problematic_file.write('| Timestamp | Event | Message | Keyword |\n')
+    problematic_file.write('| --- | --- | --- | --- |\n')
+
+
+def write_keyword_hits(problematic_file, keyword_hits):
+    '''키워드별 매칭 횟수를 표로 기록 (많이 매칭된 순)'''
+    problematic_file.write('\n### Keyword Hits\n\n')
+    problematic_file.write('| Keyword | Hits |\n')
+    problematic_file.write('| --- | --- |\n')
+    for keyword, hits in sorted(keyword_hits.items(), key=lambda item: (-item[1], item[0])):
+        problematic_file.write(f'| {keyword} | {hits} |\n')
+
+
+def read_problem_report(path=PROBLEM_REPORT_PATH):
+    '''기존 문제 로그 보고서의 표를 (timestamp, event, message, keyword) 목록으로 다시 읽음'''
+    entries = []
+    with open(path, 'r', encoding='utf-8') as problematic_file:
+        for line in problematic_file:
+            if line.startswith('### '):
+                break  # Keyword Hits 표부터는 항목이 아님
+            if not line.startswith('| ') or line.startswith('| Timestamp ') or line.startswith('| --- '):
+                continue
+            timestamp, event, rest = line.rstrip('\n')[2:-2].split(' | ', 2)
+            message, keyword = rest.rsplit(' | ', 1)
+            entries.append((timestamp, event, message, keyword))
+    return entries
+
+
+def write_problem_report(sorted_entries, pattern, path=PROBLEM_REPORT_PATH):
+    '''문제 로그 보고서만 임시 파일에 쓴 뒤 교체해서 중간에 깨진 보고서가 남지 않게 함'''
+    tmp_path = path + '.tmp'
+    keyword_hits = Counter()
+    with open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as problematic_file:
+        write_problem_header(problematic_file)
+        for timestamp, event, message, keyword in sorted_entries:
+            count_keyword_hits(keyword_hits, message, pattern)
+            problematic_file.write(f'| {timestamp} | {event} | {message} | {keyword} |\n')
+        write_keyword_hits(problematic_file, keyword_hits)
+    os.replace(tmp_path, path)
+
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as state_file:
+            return json.load(state_file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_state(state, path=STATE_PATH):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as state_file:
+        json.dump(state, state_file)
+    os.replace(tmp_path, path)
+
+
+def read_new_problems(log_path, offset, pattern):
+    '''
+    offset 바이트 이후에 추가된 완전한 줄만 파싱해서 문제 로그 목록과 새 offset을 반환
+    아직 줄바꿈이 없는 마지막 줄은 다음 번에 다시 읽는다.
+    새 구간은 메모리 맵으로 열어 키워드가 있는 줄만 디코딩한다.
+    '''
+    with open(log_path, 'rb') as log_file:
+        if log_file.seek(0, os.SEEK_END) <= offset:
+            return [], offset
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.rfind(b'\n', offset) + 1
+            if end <= offset:
+                return [], offset
+            problems = list(scan_problems(mm, compile_bytes_pattern(pattern), offset, end))
+    return problems, end
+
+
+def update_problem_report(log_path, pattern, state_path=STATE_PATH, report_path=PROBLEM_REPORT_PATH):
+    '''
+    저장된 offset/inode 이후의 새 로그만 읽어서 문제 로그 보고서를 갱신하고
+    새로 찾은 문제 로그 수를 반환
+    로그 파일이 교체되었거나(inode 변경) 잘렸으면 처음부터 다시 읽는다.
+    '''
+    stat = os.stat(log_path)
+    state = load_state(state_path)
+    if (state is None or state.get('inode') != stat.st_ino or state.get('offset', 0) > stat.st_size
+            or not os.path.exists(report_path)):
+        offset = 0
+        entries = None
+    elif state['offset'] == stat.st_size:
+        return 0
+    else:
+        offset = state['offset']
+        entries = read_problem_report(report_path)
+
+    problems, offset = read_new_problems(log_path, offset, pattern)
+    if problems or entries is None:
+        problems.sort(key=record_key, reverse=True)
+        # 같은 timestamp면 먼저 기록된 기존 항목이 앞에 오도록 기존 항목을 먼저 넘김
+        merged = heapq.merge(entries or [], problems, key=record_key, reverse=True)
+        write_problem_report(merged, pattern, report_path)
+    save_state({'inode': stat.st_ino, 'offset': offset}, state_path)
+    return len(problems)
+
+
+def follow_log(log_path, pattern, state_path=STATE_PATH, interval=FOLLOW_INTERVAL, once=False):
+    '''tail -f처럼 로그 파일을 지켜보며 새로 추가된 부분만 문제 로그 보고서에 반영'''
+    try:
+        while True:
+            found = update_problem_report(log_path, pattern, state_path)
+            if found:
+                print(f'새 문제 로그 {found}건을 보고서에 반영했습니다.')
+            if once:
+                return
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print('로그 추적을 종료합니다.')
+
+
+def parse_time_arg(value, end_of_day=False):
+    '''--from/--to 값('YYYY-MM-DD HH:MM:SS' 또는 'YYYY-MM-DD')을 epoch 초로 변환'''
+    if value is None:
+        return None
+    if len(value) == len('YYYY-MM-DD'):
+        return to_epoch(value + (' 23:59:59' if end_of_day else ' 00:00:00'))
+    return to_epoch(value)
+
+
+def print_query_result(records):
+    '''구간 검색 결과를 Markdown 표로 화면에 출력'''
+    print('| Timestamp | Event | Message |')
+    print('| --- | --- | --- |')
+    count = 0
+    for timestamp, event, message in records:
+        print(f'| {timestamp} | {event} | {message} |')
+        count += 1
+    print(f'\n총 {count}건')
+
+
+def collect_log_files(patterns):
+    '''글롭 패턴 또는 디렉터리 목록을 실제 로그 파일 경로 목록으로 변환'''
+    log_files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '*.log'))
+        else:
+            matches = glob.glob(pattern)
+        log_files.extend(path for path in sorted(matches) if os.path.isfile(path))
+    if not log_files:
+        raise FileNotFoundError(', '.join(patterns))
+    return log_files
+
+
+def sort_file_to_run(log_path, tmp_dir, pattern, chunk_size=CHUNK_SIZE):
+    '''
+    작업 프로세스에서 실행: 로그 파일 하나를 파싱, 필터링, 정렬해서
+    timestamp 역순으로 정렬된 런(run) 파일 하나로 저장하고 경로를 반환
+    '''
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as work_dir:
+        sorted_records = sort_records_desc(tag_problems(read_log_records(log_path), pattern), work_dir, chunk_size)
+        return _write_spill(sorted_records, tmp_dir)
+
+
+def analyze_logs(log_paths, pattern, workers=None, chunk_size=CHUNK_SIZE):
+    '''
+    여러 로그 파일을 프로세스 풀에서 병렬로 정렬한 뒤
+    파일별 정렬 결과를 merge_runs로 k-way 병합해 하나의 보고서로 작성
+    '''
+    with tempfile.TemporaryDirectory(prefix='log_analysis_') as tmp_dir:
+        if len(log_paths) == 1:
+            # 파일이 하나면 런 파일 없이 바로 정렬 결과를 사용
+            records = tag_problems(read_log_records(log_paths[0]), pattern)
+            write_reports(sort_records_desc(records, tmp_dir, chunk_size), pattern)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            run_paths = list(executor.map(
+                sort_file_to_run,
+                log_paths,
+                [tmp_dir] * len(log_paths),
+                [pattern] * len(log_paths),
+                [chunk_size] * len(log_paths),
+            ))
+        # 파일이 수백 개여도 동시에 여는 런 파일 수가 MERGE_FAN_IN을 넘지 않도록 단계별로 병합
+        write_reports(merge_runs(run_paths, tmp_dir), pattern)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='미션 컴퓨터 로그를 분석해 Markdown 보고서를 작성합니다.')
+    parser.add_argument(
+        'paths', nargs='*', default=[LOG_PATH],
+        help='분석할 로그 파일, 글롭 패턴 또는 디렉터리 (기본값: %(default)s)'
+    )
+    parser.add_argument(
+        '--keywords', default=None,
+        help=f'문제 키워드 파일 경로, 한 줄에 하나 (기본값: {PROBLEM_KEYWORDS_PATH})'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=None,
+        help='병렬로 실행할 작업 프로세스 수 (기본값: CPU 코어 수)'
+    )
+    parser.add_argument(
+        '--follow', action='store_true',
+        help='새로 추가된 로그만 읽어 문제 로그 보고서를 계속 갱신 (tail -f 방식)'
+    )
+    parser.add_argument(
+        '--once', action='store_true',
+        help='--follow와 함께 사용: 새 로그를 한 번만 반영하고 종료'
+    )
+    parser.add_argument(
+        '--interval', type=float, default=FOLLOW_INTERVAL,
+        help='--follow 모드에서 새 로그를 확인하는 간격(초) (기본값: %(default)s)'
+    )
+    parser.add_argument(
+        '--state-file', default=STATE_PATH,
+        help='--follow 모드의 처리 위치 저장 파일 (기본값: %(default)s)'
+    )
+    parser.add_argument(
+        '--from', dest='time_from', default=None,
+        help='이 시각 이후의 로그만 색인으로 검색 (YYYY-MM-DD[ HH:MM:SS])'
+    )
+    parser.add_argument(
+        '--to', dest='time_to', default=None,
+        help='이 시각 이전의 로그만 색인으로 검색 (YYYY-MM-DD[ HH:MM:SS])'
+    )
+    parser.add_argument(
+        '--event', default=None,
+        help='지정한 이벤트(INFO, WARNING 등)의 로그만 검색'
+    )
+    args = parser.parse_args()
+    if args.once and not args.follow:
+        parser.error('--once는 --follow와 함께 사용해야 합니다.')
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers는 1 이상이어야 합니다.')
+    return args
+
+
+def main():
+    args = parse_args()
+    print('Hello Mars')
+
+    try:
+        pattern = compile_keywords(load_keywords(args.keywords))
+        log_paths = collect_log_files(args.paths)
+        if args.follow:
+            if len(log_paths) != 1:
+                print('오류: --follow 모드는 로그 파일 하나만 지원합니다.')
+                return
+            follow_log(log_paths[0], pattern, args.state_file, args.interval, args.once)
+            return
+
+        if args.time_from or args.time_to or args.event:
+            start_epoch = parse_time_arg(args.time_from)
+            end_epoch = parse_time_arg(args.time_to, end_of_day=True)
+            for log_path in log_paths:
+                print_query_result(query_log(log_path, start_epoch, end_epoch, args.event))
+            return
+
+        analyze_logs(log_paths, pattern, args.workers)
+        print('로그 내용을 시간의 역순으로 Markdown 형식으로 성공적으로 변환하고 저장했습니다.')
+        print(f'문제가 되는 로그 엔트리 파일을 저장했습니다.')
+
+    except FileNotFoundError:
+        print('오류: 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(f'예상치 못한 오류가 발생했습니다: {e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import mmap
+import re
+
+
+def compile_bytes_pattern(pattern):
+    '''문자열 키워드 정규식을 mmap에서 바로 검색할 수 있는 bytes 정규식으로 변환'''
+    return re.compile(pattern.pattern.encode('utf-8'), pattern.flags & ~re.UNICODE)
+
+
+def scan_problems(buffer, bytes_pattern, start=0, end=None):
+    '''
+    buffer(mmap 등)의 [start, end) 구간에서 문제 키워드가 들어 있는 줄만 찾아
+    (timestamp, event, message, keyword)를 돌려주는 제너레이터
+    줄을 하나씩 나누지 않고 키워드를 바로 검색한 뒤, 매칭된 줄에서만 쉼표 위치를 찾고
+    memoryview 구간을 그대로 디코딩해서 나머지 줄은 문자열로 만들지 않는다.
+    start가 0이면 첫 줄(헤더)은 건너뛴다.
+    '''
+    if end is None:
+        end = len(buffer)
+    if start == 0:
+        start = buffer.find(b'\n', 0, end) + 1 or end
+    view = memoryview(buffer)
+    search = bytes_pattern.search
+    try:
+        pos = start
+        while pos < end:
+            match = search(buffer, pos, end)
+            if match is None:
+                return
+            line_start = buffer.rfind(b'\n', start, match.start()) + 1 or start
+            line_end = buffer.find(b'\n', match.start(), end)
+            if line_end == -1:
+                line_end = end
+            pos = line_end + 1
+
+            first_comma = buffer.find(b',', line_start, line_end)
+            second_comma = buffer.find(b',', first_comma + 1, line_end) if first_comma != -1 else -1
+            if second_comma == -1:
+                continue  # 형식이 맞지 않는 줄
+            if match.start() <= second_comma:
+                # timestamp나 event 부분에서 매칭된 경우 메시지 안에서 다시 검색
+                match = search(buffer, second_comma + 1, line_end)
+                if match is None:
+                    continue
+
+            yield (
+                str(view[line_start:first_comma], 'utf-8'),
+                str(view[first_comma + 1:second_comma], 'utf-8'),
+                str(view[second_comma + 1:line_end], 'utf-8'),
+                str(view[match.start():match.end()], 'utf-8'),
+            )
+    finally:
+        view.release()
+
+
+def iter_problems_mmap(log_path, bytes_pattern):
+    '''로그 파일 전체를 메모리 맵으로 열어 문제 로그만 파싱'''
+    with open(log_path, 'rb') as log_file:
+        if log_file.seek(0, 2) == 0:
+            return
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from scan_problems(mm, bytes_pattern)
@@ -0,0 +1,59 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from inventory_binary import InventoryBinaryReader, write_inventory_binary
+from inventory_engine import FLAMMABILITY, InventoryTable
+
+HEADER = ['Substance', 'Weight (g/cm³)', 'Specific Gravity', 'Strength', 'Flammability']
+STRENGTHS = ('Very weak', 'Weak', 'Moderate', 'High', 'Very high', 'Various')
+
+
+def generate_inventory(path, rows):
+    '''rows개의 합성 인벤토리 CSV를 생성 (일부 값은 'Various')'''
+    rng = random.Random(0)
+    with open(path, 'w', encoding='utf-8', buffering=1024 * 1024) as file:
+        file.write(','.join(HEADER) + '\n')
+        for i in range(rows):
+            weight = 'Various' if rng.random() < 0.2 else f'{rng.uniform(0.001, 20):.3f}'
+            file.write(f'Substance {i},{weight},{weight},{rng.choice(STRENGTHS)},{rng.random():.2f}\n')
+
+
+def bench(label, func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f'{label:<36} {elapsed * 1000:10.2f} ms')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV와 이진 인벤토리 파일의 읽기 속도를 비교합니다.')
+    parser.add_argument('--rows', type=int, default=1000000, help='합성 인벤토리 행 수 (기본값: %(default)s)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='inventory_bench_') as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'inventory.csv')
+        bin_path = os.path.join(tmp_dir, 'inventory.bin')
+        generate_inventory(csv_path, args.rows)
+        write_inventory_binary(InventoryTable.from_csv(csv_path), bin_path)
+        print(f'{args.rows}행: CSV {os.path.getsize(csv_path):,} bytes, 이진 {os.path.getsize(bin_path):,} bytes')
+
+        # CSV는 매번 전체를 파싱하고 정렬해야 인화성 열과 위험 목록을 얻을 수 있다.
+        bench('CSV 로드 + 정렬 + 위험 목록', lambda: len(
+            InventoryTable.from_csv(csv_path).sorted_by_flammability().dangerous().column('Substance')
+        ))
+
+        with InventoryBinaryReader(bin_path) as reader:
+            bench('이진 파일 열기', lambda: InventoryBinaryReader(bin_path).close(), repeat=100)
+            bench('이진 인화성 열 전체 읽기', lambda: len(reader.column(FLAMMABILITY)))
+            bench('이진 위험 목록 (>= 0.7) 읽기', lambda: sum(1 for _ in reader.scan(0.7)))
+            indices = [random.randrange(len(reader)) for _ in range(10000)]
+            bench('이진 임의 접근 10,000건', lambda: [reader.row(i) for i in indices])
+
+
+if __name__ == '__main__':
+    main()
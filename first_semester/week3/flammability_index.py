@@ -0,0 +1,194 @@
+import argparse
+import bisect
+import csv
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+
+from inventory_engine import FLAMMABILITY, to_float
+
+INDEX_MAGIC = b'FLAMIDX1'
+# 헤더: 매직, CSV mtime(ns), CSV 크기, CSV SHA-256, 레코드 수
+HEADER = struct.Struct('<8sqQ32sQ')
+INVENTORY_PATH = './Mars_Base_Inventory_List.csv'
+
+
+def default_index_path(csv_path):
+    return csv_path + '.idx'
+
+
+def file_digest(path):
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            sha256.update(block)
+    return sha256.digest()
+
+
+def _scan_csv(csv_path):
+    '''CSV를 읽어 (인화성 지수, 줄 시작 offset) 목록을 인화성 내림차순으로 반환'''
+    entries = []
+    with open(csv_path, 'rb') as file:
+        header = next(csv.reader([file.readline().decode('utf-8')]))
+        column = header.index(FLAMMABILITY)
+        offset = file.tell()
+        for raw_line in file:
+            line_offset = offset
+            offset += len(raw_line)
+            line = raw_line.decode('utf-8').rstrip('\r\n')
+            if not line:
+                continue
+            value = to_float(next(csv.reader([line]))[column])
+            if value == value:  # 숫자가 아닌 값(NaN)은 색인에서 제외
+                entries.append((-value, line_offset))
+    entries.sort()  # 인화성 내림차순, 같은 값이면 CSV 순서
+    return entries
+
+
+def build_index(csv_path, index_path=None, digest=None):
+    '''CSV의 인화성 지수 색인 파일을 새로 만든다'''
+    index_path = index_path or default_index_path(csv_path)
+    stat = os.stat(csv_path)
+    entries = _scan_csv(csv_path)
+    values = array('d', [-value for value, _ in entries])
+    offsets = array('Q', [offset for _, offset in entries])
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as index_file:
+        index_file.write(HEADER.pack(
+            INDEX_MAGIC, stat.st_mtime_ns, stat.st_size, digest or file_digest(csv_path), len(entries)
+        ))
+        index_file.write(values.tobytes())
+        index_file.write(offsets.tobytes())
+    os.replace(tmp_path, index_path)
+    return index_path
+
+
+def ensure_index(csv_path, index_path=None):
+    '''
+    색인이 CSV와 일치하는지 확인하고 필요할 때만 다시 만든다.
+    mtime과 크기가 같으면 바로 사용하고, mtime만 바뀌고 내용(해시)이 같으면
+    헤더의 mtime만 갱신한다. 내용이 바뀌었으면 색인을 다시 만든다.
+    '''
+    index_path = index_path or default_index_path(csv_path)
+    stat = os.stat(csv_path)
+    try:
+        with open(index_path, 'rb') as index_file:
+            header = index_file.read(HEADER.size)
+    except FileNotFoundError:
+        return build_index(csv_path, index_path)
+    if len(header) != HEADER.size or header[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+        return build_index(csv_path, index_path)
+
+    _, mtime_ns, size, digest, count = HEADER.unpack(header)
+    if mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+        return index_path
+
+    current_digest = file_digest(csv_path)
+    if size != stat.st_size or digest != current_digest:
+        return build_index(csv_path, index_path, current_digest)
+
+    with open(index_path, 'r+b') as index_file:
+        index_file.write(HEADER.pack(INDEX_MAGIC, stat.st_mtime_ns, size, digest, count))
+    return index_path
+
+
+class _DescendingValues:
+    '''인화성 내림차순 배열을 bisect가 오름차순으로 탐색하도록 부호를 바꿔 보여주는 뷰'''
+
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i):
+        return -self.values[i]
+
+
+class FlammabilityIndex:
+    '''
+    CSV 옆에 저장된 인화성 지수 색인
+    정렬된 인화성 배열을 이진 탐색해 임계값, 구간, 상위 k개 질의에 답하고
+    해당 행만 CSV에서 offset으로 찾아 읽는다.
+    '''
+
+    def __init__(self, csv_path=INVENTORY_PATH, index_path=None):
+        self.csv_path = csv_path
+        self.index_path = ensure_index(csv_path, index_path)
+        self.index_file = open(self.index_path, 'rb')
+        self.mm = mmap.mmap(self.index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        count = HEADER.unpack_from(self.mm)[-1]
+        values_end = HEADER.size + count * 8
+        self.values = memoryview(self.mm)[HEADER.size:values_end].cast('d')
+        self.offsets = memoryview(self.mm)[values_end:values_end + count * 8].cast('Q')
+        self.keys = _DescendingValues(self.values)
+        self.csv_file = open(csv_path, 'rb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.values)
+
+    def close(self):
+        self.values.release()
+        self.offsets.release()
+        self.mm.close()
+        self.index_file.close()
+        self.csv_file.close()
+
+    def row(self, i):
+        '''색인의 i번째(인화성 내림차순) 행을 CSV에서 읽어 반환'''
+        self.csv_file.seek(self.offsets[i])
+        return next(csv.reader([self.csv_file.readline().decode('utf-8').rstrip('\r\n')]))
+
+    def _rows(self, start, stop):
+        return [self.row(i) for i in range(start, stop)]
+
+    def at_least(self, threshold):
+        '''인화성 지수 >= threshold 인 행'''
+        return self._rows(0, bisect.bisect_right(self.keys, -threshold))
+
+    def between(self, low, high):
+        '''low <= 인화성 지수 <= high 인 행'''
+        start = bisect.bisect_left(self.keys, -high)
+        stop = bisect.bisect_right(self.keys, -low)
+        return self._rows(start, max(start, stop))
+
+    def top_k(self, k):
+        '''인화성 지수가 가장 높은 k개 행'''
+        return self._rows(0, min(k, len(self)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='인화성 지수 색인으로 인벤토리를 검색합니다.')
+    parser.add_argument('--csv', default=INVENTORY_PATH, help='인벤토리 CSV 경로 (기본값: %(default)s)')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--min', type=float, help='인화성 지수가 이 값 이상인 항목')
+    group.add_argument('--between', type=float, nargs=2, metavar=('LOW', 'HIGH'), help='인화성 지수 구간')
+    group.add_argument('--top', type=int, help='인화성 지수가 가장 높은 항목 수')
+    args = parser.parse_args()
+
+    try:
+        with FlammabilityIndex(args.csv) as index:
+            if args.min is not None:
+                rows = index.at_least(args.min)
+            elif args.between is not None:
+                rows = index.between(*args.between)
+            else:
+                rows = index.top_k(args.top)
+        for row in rows:
+            print(','.join(row))
+    except FileNotFoundError:
+        print('Error: 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(f'Error: {e}')
+
+
+if __name__ == '__main__':
+    main()
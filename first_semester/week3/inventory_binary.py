@@ -0,0 +1,203 @@
+import bisect
+import math
+import mmap
+import struct
+from array import array
+
+from inventory_engine import FLAMMABILITY, InventoryTable
+
+MAGIC = b'MARSINV1'
+VERSION = 1
+# 헤더: 매직, 버전, 열 수, 숫자 열 수, 레코드 수, 정렬 키가 숫자인 레코드 수, 문자열 테이블 크기
+HEADER = struct.Struct('<8sHHHxxQQQ')
+# 스키마 항목(열마다): 숫자 열 번호(문자열 열이면 -1), 열 이름의 문자열 참조(offset, length)
+SCHEMA_ENTRY = struct.Struct('<hxxII')
+COLUMN_TYPE_TEXT = -1
+
+
+def _align8(size):
+    return (size + 7) & ~7
+
+
+class _StringTable:
+    '''중복 없는 UTF-8 문자열 테이블'''
+
+    def __init__(self):
+        self.refs = {}
+        self.chunks = []
+        self.size = 0
+
+    def add(self, text):
+        ref = self.refs.get(text)
+        if ref is None:
+            data = text.encode('utf-8')
+            ref = (self.size, len(data))
+            self.refs[text] = ref
+            self.chunks.append(data)
+            self.size += len(data)
+        return ref
+
+    def tobytes(self):
+        return b''.join(self.chunks)
+
+
+class InventoryBinaryBuilder:
+    '''
+    정렬된 행을 하나씩 받아 이진 인벤토리 파일 내용을 만드는 빌더
+    [헤더][스키마][문자열 테이블][레코드...] 순서이며 행은 sort_column 내림차순으로 넣어야 한다.
+    레코드 하나는 숫자 열 float64 값들 + 모든 열의 원본 문자열 참조로 이루어져
+    원래 CSV 문자열을 그대로 복원할 수 있다.
+    '''
+
+    def __init__(self, table, sort_column=FLAMMABILITY):
+        if sort_column not in table.values:
+            raise ValueError(f'{sort_column} 열에 숫자 값이 없습니다.')
+        self.header = list(table.header)
+        # 정렬 키 열을 첫 번째 숫자 열로 두어 범위 검색 시 바로 읽을 수 있게 함
+        self.numeric_names = [sort_column] + [
+            name for name in table.header if name in table.values and name != sort_column
+        ]
+        self.strings = _StringTable()
+        self.schema = b''.join(
+            SCHEMA_ENTRY.pack(
+                self.numeric_names.index(name) if name in self.numeric_names else COLUMN_TYPE_TEXT,
+                *self.strings.add(name)
+            )
+            for name in self.header
+        )
+        self.record = struct.Struct('<' + 'd' * len(self.numeric_names) + 'I' * 2 * len(self.header))
+        self.records = bytearray()
+        self.count = 0
+        self.valid_count = 0
+
+    def add(self, row, numbers):
+        '''행 하나를 추가, numbers는 numeric_names 순서의 숫자 값'''
+        refs = []
+        for value in row:
+            refs.extend(self.strings.add(value))
+        self.records += self.record.pack(*numbers, *refs)
+        self.count += 1
+        if not math.isnan(numbers[0]):
+            self.valid_count += 1
+
+    def tobytes(self):
+        string_bytes = self.strings.tobytes()
+        head = HEADER.pack(
+            MAGIC, VERSION, len(self.header), len(self.numeric_names),
+            self.count, self.valid_count, len(string_bytes)
+        ) + self.schema + string_bytes
+        return head + b'\0' * (_align8(len(head)) - len(head)) + self.records
+
+
+def write_inventory_binary(table, path, sort_column=FLAMMABILITY):
+    '''인벤토리를 sort_column 내림차순으로 정렬해 고정 길이 레코드 이진 파일로 저장'''
+    builder = InventoryBinaryBuilder(table, sort_column)
+    table = table.take(table.argsort(sort_column, reverse=True))
+    numeric_columns = [table.numeric(name) for name in builder.numeric_names]
+    for i, row in enumerate(table.rows()):
+        builder.add(row, [column[i] for column in numeric_columns])
+    with open(path, 'wb') as binary_file:
+        binary_file.write(builder.tobytes())
+
+
+class _DescendingKeys:
+    '''내림차순 정렬 키를 bisect가 오름차순으로 탐색할 수 있도록 부호를 바꿔 보여주는 뷰'''
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def __len__(self):
+        return self.reader.valid_count
+
+    def __getitem__(self, i):
+        return -self.reader.sort_value(i)
+
+
+class InventoryBinaryReader:
+    '''
+    이진 인벤토리 파일을 메모리 맵으로 열어 레코드를 O(1)로 읽는 리더
+    숫자 열은 memoryview를 float64로 cast해서 복사 없이 바로 읽는다.
+    '''
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, column_count, self.numeric_count,
+         self.count, self.valid_count, string_size) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'{path}: 인벤토리 이진 파일 형식이 아닙니다.')
+
+        string_start = HEADER.size + SCHEMA_ENTRY.size * column_count
+        self.strings = memoryview(self.mm)[string_start:string_start + string_size]
+        self.header = []
+        self.numeric_index = {}
+        for i in range(column_count):
+            numeric_index, offset, length = SCHEMA_ENTRY.unpack_from(self.mm, HEADER.size + i * SCHEMA_ENTRY.size)
+            name = self._string(offset, length)
+            self.header.append(name)
+            if numeric_index != COLUMN_TYPE_TEXT:
+                self.numeric_index[name] = numeric_index
+
+        self.record_start = _align8(string_start + string_size)
+        self.record = struct.Struct('<' + 'd' * self.numeric_count + 'I' * 2 * column_count)
+        self.record_words = self.record.size // 8
+        self.doubles = memoryview(self.mm)[self.record_start:self.record_start + self.record.size * self.count].cast('d')
+        self.refs = memoryview(self.mm)[self.record_start:self.record_start + self.record.size * self.count].cast('I')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        for view in ('strings', 'doubles', 'refs'):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self.mm.close()
+        self.file.close()
+
+    def _string(self, offset, length):
+        return str(self.strings[offset:offset + length], 'utf-8')
+
+    def sort_value(self, i):
+        '''i번째 레코드의 정렬 키(인화성 지수) 값'''
+        return self.doubles[i * self.record_words]
+
+    def value(self, name, i):
+        '''i번째 레코드의 숫자 열 값 (숫자가 아니면 NaN)'''
+        return self.doubles[i * self.record_words + self.numeric_index[name]]
+
+    def row(self, i):
+        '''i번째 레코드를 원본 문자열 튜플로 반환'''
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        start = (i * self.record.size + self.numeric_count * 8) // 4
+        refs = self.refs[start:start + 2 * len(self.header)]
+        return tuple(self._string(refs[j], refs[j + 1]) for j in range(0, len(refs), 2))
+
+    def column(self, name):
+        '''숫자 열 전체를 array('d')로 반환 (레코드 간격만큼 건너뛰며 한 번에 복사)'''
+        return array('d', self.doubles[self.numeric_index[name]::self.record_words])
+
+    def find_range(self, low=-math.inf, high=math.inf):
+        '''low <= 정렬 키 <= high 인 레코드의 [start, stop) 구간을 이진 탐색으로 찾음'''
+        keys = _DescendingKeys(self)
+        start = bisect.bisect_left(keys, -high)
+        stop = bisect.bisect_right(keys, -low)
+        return start, max(start, stop)
+
+    def scan(self, low=-math.inf, high=math.inf):
+        '''정렬 키가 [low, high] 구간인 레코드를 내림차순으로 돌려준다'''
+        start, stop = self.find_range(low, high)
+        return (self.row(i) for i in range(start, stop))
+
+    def rows(self):
+        return (self.row(i) for i in range(self.count))
+
+    def to_table(self):
+        return InventoryTable.from_rows(self.header, self.rows())
@@ -0,0 +1,111 @@
+import csv
+import math
+from array import array
+
+FLAMMABILITY = 'Flammability'
+DANGER_THRESHOLD = 0.7
+
+
+def to_float(value):
+    '''숫자로 바꿀 수 없는 값('Various' 등)은 NaN으로 표시'''
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+
+class InventoryTable:
+    '''
+    인벤토리를 행 목록 대신 열 단위로 보관하는 표
+    모든 열은 원본 문자열 목록(문자열 테이블)으로 두고, 숫자가 하나라도 있는 열은
+    array('d') 숫자 열을 함께 만들어 정렬과 필터링 때 float 변환을 반복하지 않는다.
+    숫자가 아닌 값은 NaN으로 저장되어 마스크에서 제외된다.
+    '''
+
+    def __init__(self, header, columns):
+        self.header = list(header)
+        self.columns = columns
+        self.values = {}
+        for name, column in zip(self.header, columns):
+            numbers = array('d', map(to_float, column))
+            if any(not math.isnan(number) for number in numbers):
+                self.values[name] = numbers
+
+    @classmethod
+    def from_rows(cls, header, rows):
+        '''
+        행 목록으로 표를 만든다. 빈 줄은 건너뛰고,
+        필드 수가 머리글과 다른 행은 열이 어긋나지 않도록 ValueError로 거부한다.
+        '''
+        width = len(header)
+        columns = [[] for _ in header]
+        appenders = [column.append for column in columns]
+        for line_number, row in enumerate(rows, start=2):
+            if not row:
+                continue
+            if len(row) != width:
+                raise ValueError(f'{line_number}번째 줄의 필드 수({len(row)})가 머리글({width})과 다릅니다: {row}')
+            for append, value in zip(appenders, row):
+                append(value)
+        return cls(header, columns)
+
+    @classmethod
+    def from_csv(cls, path):
+        '''CSV 파일을 한 번만 읽어 열 단위 표로 변환'''
+        with open(path, 'r', encoding='utf-8', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            return cls.from_rows(header, reader)
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def column(self, name):
+        return self.columns[self.header.index(name)]
+
+    def numeric(self, name):
+        '''숫자 열(array('d'))을 반환, 숫자가 아닌 값은 NaN'''
+        return self.values[name]
+
+    def valid_mask(self, name):
+        '''숫자로 읽을 수 있는 값이면 True인 마스크'''
+        return [not math.isnan(number) for number in self.values[name]]
+
+    def mask_ge(self, name, threshold):
+        '''값이 threshold 이상이면 True인 마스크 (NaN은 항상 False)'''
+        return [number >= threshold for number in self.values[name]]
+
+    def argsort(self, name, reverse=False):
+        '''
+        숫자 열의 정렬 순서(행 번호 목록)를 반환
+        NaN 값은 정렬 방향과 관계없이 맨 뒤에 원래 순서대로 둔다.
+        '''
+        numbers = self.values[name]
+        valid = [i for i, number in enumerate(numbers) if not math.isnan(number)]
+        masked = [i for i, number in enumerate(numbers) if math.isnan(number)]
+        return sorted(valid, key=numbers.__getitem__, reverse=reverse) + masked
+
+    def take(self, indices):
+        '''지정한 행 번호 순서대로 새 표를 만든다'''
+        indices = list(indices)
+        table = InventoryTable.__new__(InventoryTable)
+        table.header = list(self.header)
+        table.columns = [[column[i] for i in indices] for column in self.columns]
+        table.values = {
+            name: array('d', [numbers[i] for i in indices])
+            for name, numbers in self.values.items()
+        }
+        return table
+
+    def filter(self, mask):
+        return self.take(i for i, keep in enumerate(mask) if keep)
+
+    def rows(self):
+        '''원본 문자열 행을 차례대로 돌려준다'''
+        return zip(*self.columns)
+
+    def sorted_by_flammability(self):
+        return self.take(self.argsort(FLAMMABILITY, reverse=True))
+
+    def dangerous(self, threshold=DANGER_THRESHOLD):
+        return self.filter(self.mask_ge(FLAMMABILITY, threshold))
@@ -0,0 +1,69 @@
+import csv
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+
+from inventory_binary import InventoryBinaryBuilder
+from inventory_engine import DANGER_THRESHOLD, FLAMMABILITY
+
+
+@contextmanager
+def atomic_open(path, mode='wb', **kwargs):
+    '''
+    같은 디렉터리의 임시 파일을 열어 주고, 블록이 정상 종료되면 fsync한 뒤 os.replace로 교체
+    중간에 중단되어도 원래 파일이나 완성된 새 파일 중 하나만 남는다.
+    '''
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as tmp_file:
+            yield tmp_file
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write(path, data):
+    '''data를 임시 파일에 한 번에 쓴 뒤 원자적으로 교체'''
+    with atomic_open(path) as file:
+        file.write(data)
+
+
+def make_csv_writer(file):
+    '''
+    인벤토리 CSV용 csv.writer (줄 끝은 '\\n')
+    쉼표나 따옴표가 들어 있는 값도 다시 읽을 수 있도록 csv.writer로 인용 처리한다.
+    '''
+    return csv.writer(file, lineterminator='\n')
+
+
+def export_inventory(inventory, csv_path, danger_path, binary_path, threshold=DANGER_THRESHOLD):
+    '''
+    인화성 내림차순으로 정렬된 인벤토리를 한 번만 훑으면서
+    전체 CSV, 위험 물질 CSV, 이진 파일 내용을 함께 만들고 각각 원자적으로 저장
+    '''
+    csv_buffer = io.StringIO()
+    danger_buffer = io.StringIO()
+    csv_writer = make_csv_writer(csv_buffer)
+    danger_writer = make_csv_writer(danger_buffer)
+    csv_writer.writerow(inventory.header)
+    danger_writer.writerow(inventory.header)
+    builder = InventoryBinaryBuilder(inventory)
+    numeric_columns = [inventory.numeric(name) for name in builder.numeric_names]
+    flammability = inventory.numeric(FLAMMABILITY)
+
+    for i, row in enumerate(inventory.rows()):
+        csv_writer.writerow(row)
+        if flammability[i] >= threshold:
+            danger_writer.writerow(row)
+        builder.add(row, [column[i] for column in numeric_columns])
+
+    # 위험 목록과 이진 파일을 먼저 쓰고, 원본 데이터인 전체 CSV는 마지막에 교체
+    atomic_write(danger_path, danger_buffer.getvalue().encode('utf-8'))
+    atomic_write(binary_path, builder.tobytes())
+    atomic_write(csv_path, csv_buffer.getvalue().encode('utf-8'))
@@ -0,0 +1,164 @@
+import argparse
+import csv
+import glob
+import heapq
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from inventory_engine import DANGER_THRESHOLD, FLAMMABILITY, to_float
+from inventory_export import atomic_open, make_csv_writer
+from inventory_stream import iter_inventory
+
+MERGED_PATH = './Mars_Base_Inventory_merged.csv'
+MERGED_DANGER_PATH = './Mars_Base_Inventory_merged_danger.csv'
+RULE_MAX = 'max'  # 이름이 같으면 인화성 지수가 가장 높은 항목을 남김
+RULE_LATEST = 'latest'  # 이름이 같으면 가장 최근에 수정된 파일의 항목을 남김
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def flammability_key(value):
+    '''정렬용 인화성 지수, 숫자가 아닌 값은 가장 작은 값으로 취급'''
+    number = to_float(value)
+    return -math.inf if math.isnan(number) else number
+
+
+def collect_inventory_files(patterns):
+    '''파일 경로, 글롭 패턴, 디렉터리를 인벤토리 CSV 경로 목록으로 변환'''
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, '*.csv'))
+        else:
+            matches = glob.glob(pattern)
+        paths.extend(path for path in sorted(matches) if os.path.isfile(path))
+    if not paths:
+        raise FileNotFoundError(', '.join(patterns))
+    return paths
+
+
+def sort_file_to_run(path, tmp_dir, rule):
+    '''
+    작업 프로세스에서 실행: 인벤토리 파일 하나를 읽어 파일 안의 중복 이름을 정리하고
+    인화성 내림차순으로 정렬된 런(run) 파일로 저장
+    (헤더, 런 파일 경로, 이 파일에 있는 이름 목록)을 반환
+    '''
+    header, rows = iter_inventory(path)
+    name_column = 0
+    column = header.index(FLAMMABILITY)
+    best = {}
+    for row in rows:
+        name = row[name_column]
+        current = best.get(name)
+        if (current is None or rule == RULE_LATEST
+                or flammability_key(row[column]) > flammability_key(current[column])):
+            best[name] = row
+
+    sorted_rows = sorted(best.values(), key=lambda row: flammability_key(row[column]), reverse=True)
+    fd, run_path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE) as run_file:
+        csv.writer(run_file).writerows(sorted_rows)
+    return header, run_path, list(best)
+
+
+def _read_run(path, rank, column):
+    with open(path, 'r', encoding='utf-8', newline='') as run_file:
+        for row in csv.reader(run_file):
+            yield flammability_key(row[column]), rank, row
+
+
+def _file_ranks(paths, rule):
+    '''충돌 시 우선순위: latest 규칙은 수정 시각이 늦은 파일일수록 높다'''
+    if rule == RULE_LATEST:
+        order = sorted(range(len(paths)), key=lambda i: (os.path.getmtime(paths[i]), i))
+    else:
+        order = range(len(paths))
+    ranks = [0] * len(paths)
+    for rank, i in enumerate(order):
+        ranks[i] = rank
+    return ranks
+
+
+def merge_inventories(paths, output_path=MERGED_PATH, danger_path=MERGED_DANGER_PATH,
+                      rule=RULE_MAX, threshold=DANGER_THRESHOLD, workers=None):
+    '''
+    여러 인벤토리 파일을 프로세스 풀에서 병렬로 정렬하고, 파일별 정렬 결과를
+    heapq.merge로 k-way 병합해 이름이 중복되지 않는 전체 목록과 위험 물질 목록을 저장
+    저장한 (전체 항목 수, 위험 물질 수)를 반환
+    '''
+    ranks = _file_ranks(paths, rule)
+    with tempfile.TemporaryDirectory(prefix='inventory_merge_') as tmp_dir:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                sort_file_to_run, paths, [tmp_dir] * len(paths), [rule] * len(paths)
+            ))
+
+        header = results[0][0]
+        for path, (file_header, _, _) in zip(paths, results):
+            if file_header != header:
+                raise ValueError(f'{path}: 헤더가 다른 인벤토리 파일입니다.')
+        column = header.index(FLAMMABILITY)
+
+        # latest 규칙: 이름마다 우선순위가 가장 높은 파일을 미리 정해 둔다.
+        winners = {}
+        if rule == RULE_LATEST:
+            for rank, (_, _, names) in zip(ranks, results):
+                for name in names:
+                    if winners.get(name, -1) < rank:
+                        winners[name] = rank
+
+        runs = [_read_run(run_path, rank, column) for rank, (_, run_path, _) in zip(ranks, results)]
+        # 인화성 내림차순, 같은 값이면 우선순위가 높은 파일의 항목이 먼저 온다.
+        merged = heapq.merge(*runs, key=lambda item: (item[0], item[1]), reverse=True)
+
+        emitted = set()
+        count = danger_count = 0
+        with atomic_open(output_path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE) as output_file, \
+                atomic_open(danger_path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE) as danger_file:
+            output_writer = make_csv_writer(output_file)
+            danger_writer = make_csv_writer(danger_file)
+            output_writer.writerow(header)
+            danger_writer.writerow(header)
+            for key, rank, row in merged:
+                name = row[0]
+                if name in emitted or (rule == RULE_LATEST and winners[name] != rank):
+                    continue
+                emitted.add(name)
+                output_writer.writerow(row)
+                count += 1
+                if key >= threshold:
+                    danger_writer.writerow(row)
+                    danger_count += 1
+    return count, danger_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='여러 기지의 인벤토리 파일을 하나로 병합합니다.')
+    parser.add_argument('paths', nargs='+', help='병합할 인벤토리 CSV, 글롭 패턴 또는 디렉터리')
+    parser.add_argument('--rule', choices=(RULE_MAX, RULE_LATEST), default=RULE_MAX,
+                        help='같은 이름의 물질이 있을 때 남길 항목 (기본값: %(default)s)')
+    parser.add_argument('--output', default=MERGED_PATH, help='병합된 인벤토리 경로 (기본값: %(default)s)')
+    parser.add_argument('--danger-output', default=MERGED_DANGER_PATH,
+                        help='병합된 위험 물질 목록 경로 (기본값: %(default)s)')
+    parser.add_argument('--threshold', type=float, default=DANGER_THRESHOLD,
+                        help='위험 물질 인화성 지수 기준 (기본값: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None, help='작업 프로세스 수 (기본값: CPU 코어 수)')
+    args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers는 1 이상이어야 합니다.')
+
+    try:
+        paths = collect_inventory_files(args.paths)
+        count, danger_count = merge_inventories(
+            paths, args.output, args.danger_output, args.rule, args.threshold, args.workers
+        )
+        print(f'{len(paths)}개 파일을 병합했습니다: 전체 {count}건, 위험 물질 {danger_count}건')
+    except FileNotFoundError:
+        print('Error: 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(f'Error: {e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import csv
+import heapq
+import io
+import math
+from itertools import islice
+
+from inventory_engine import DANGER_THRESHOLD, FLAMMABILITY, to_float
+from inventory_export import atomic_write, make_csv_writer
+
+INVENTORY_PATH = './Mars_Base_Inventory_List.csv'
+DANGER_PATH = './Mars_Base_Inventory_danger.csv'
+READ_BUFFER_SIZE = 1024 * 1024  # 파일을 읽어 들이는 단위(바이트)
+CHUNK_ROWS = 10000  # 한 번에 넘겨주는 행 수
+
+
+def _checked_rows(reader, width):
+    '''빈 줄을 건너뛰고 필드 수가 width와 다른 행이 있으면 ValueError'''
+    for row in reader:
+        if not row:
+            continue
+        if len(row) != width:
+            raise ValueError(f'{reader.line_num}번째 줄의 필드 수({len(row)})가 머리글({width})과 다릅니다: {row}')
+        yield row
+
+
+def iter_inventory_chunks(path, chunk_rows=CHUNK_ROWS):
+    '''
+    매니페스트 CSV를 READ_BUFFER_SIZE 단위로 읽어 chunk_rows개씩 행 목록을 돌려주는 제너레이터
+    첫 번째로 헤더를 돌려주고, 이후에는 행 묶음을 돌려준다.
+    빈 줄은 건너뛰고, 필드 수가 머리글과 다른 행은 열이 어긋나지 않도록 ValueError로 거부한다.
+    '''
+    with open(path, 'r', encoding='utf-8', newline='', buffering=READ_BUFFER_SIZE) as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        yield header
+        rows = _checked_rows(reader, len(header))
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_inventory(path, chunk_rows=CHUNK_ROWS):
+    '''헤더와 행 제너레이터를 반환, 전체 매니페스트를 메모리에 올리지 않는다'''
+    chunks = iter_inventory_chunks(path, chunk_rows)
+    header = next(chunks)
+
+    def rows():
+        for chunk in chunks:
+            yield from chunk
+
+    return header, rows()
+
+
+def _sort_key(column):
+    '''인화성 지수 정렬 키, 숫자가 아닌 값은 가장 작은 값으로 취급'''
+    def key(row):
+        value = to_float(row[column])
+        return -math.inf if math.isnan(value) else value
+    return key
+
+
+def top_k(rows, column, k):
+    '''인화성 지수가 가장 높은 k개 행 (힙 크기가 k로 고정되어 메모리는 O(k))'''
+    return heapq.nlargest(k, rows, key=_sort_key(column))
+
+
+def above_threshold(rows, column, threshold=DANGER_THRESHOLD, limit=None):
+    '''
+    인화성 지수가 threshold 이상인 행을 내림차순으로 반환
+    limit을 주면 크기 limit의 힙만 유지하고, 주지 않으면 조건을 만족하는 행만 모아 정렬한다.
+    '''
+    key = _sort_key(column)
+    matching = (row for row in rows if key(row) >= threshold)
+    if limit is not None:
+        return heapq.nlargest(limit, matching, key=key)
+    return sorted(matching, key=key, reverse=True)
+
+
+def write_danger_list(path=INVENTORY_PATH, danger_path=DANGER_PATH, threshold=DANGER_THRESHOLD, limit=None):
+    '''매니페스트를 스트리밍으로 읽어 위험 물질 목록만 저장하고 저장한 행 수를 반환'''
+    header, rows = iter_inventory(path)
+    danger = above_threshold(rows, header.index(FLAMMABILITY), threshold, limit)
+    buffer = io.StringIO()
+    writer = make_csv_writer(buffer)
+    writer.writerow(header)
+    writer.writerows(danger)
+    atomic_write(danger_path, buffer.getvalue().encode('utf-8'))
+    return len(danger)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='대용량 매니페스트에서 위험 물질 목록을 스트리밍으로 추출합니다.')
+    parser.add_argument('manifest', nargs='?', default=INVENTORY_PATH, help='매니페스트 CSV (기본값: %(default)s)')
+    parser.add_argument('--output', default=DANGER_PATH, help='위험 물질 CSV 경로 (기본값: %(default)s)')
+    parser.add_argument('--threshold', type=float, default=DANGER_THRESHOLD, help='인화성 지수 기준 (기본값: %(default)s)')
+    parser.add_argument('--top', type=int, default=None, help='기준 이상인 항목 중 인화성 지수가 높은 순으로 최대 개수')
+    args = parser.parse_args()
+
+    try:
+        count = write_danger_list(args.manifest, args.output, args.threshold, args.top)
+        print(f'위험 물질 {count}건을 {args.output}에 저장했습니다.')
+    except FileNotFoundError:
+        print('Error: 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(f'Error: {e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import os
+import tempfile
+import time
+
+from mars_mission_computer import DummySensor, SensorLogWriter, format_log_entry
+
+
+class AppendPerReadingWriter:
+    '''기존 방식: 센서 값을 읽을 때마다 로그 파일을 열고 한 줄 쓰고 닫음'''
+
+    def __init__(self, path):
+        self.path = path
+
+    def write_reading(self, current_time, env):
+        with open(self.path, 'a', encoding='utf-8') as log_file:
+            log_file.write(format_log_entry(current_time, env))
+
+    def close(self):
+        pass
+
+
+def bench(label, writer, readings):
+    sensor = DummySensor(seed=0, log_writer=writer)
+    start = time.perf_counter()
+    for _ in range(readings):
+        sensor.set_env()
+        sensor.get_env()
+    writer.close()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<28} {readings / elapsed:12,.0f} readings/sec')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='센서 로그 기록 방식별 처리량을 비교합니다.')
+    parser.add_argument('--readings', type=int, default=100000, help='기록할 센서 값 수 (기본값: %(default)s)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='log_writer_bench_') as tmp_dir:
+        before_path = os.path.join(tmp_dir, 'before.txt')
+        after_path = os.path.join(tmp_dir, 'after.txt')
+        bench('open/append/close 매번', AppendPerReadingWriter(before_path), args.readings)
+        bench('SensorLogWriter (버퍼)', SensorLogWriter(after_path), args.readings)
+        if os.path.getsize(before_path) != os.path.getsize(after_path):
+            print('경고: 두 방식의 로그 크기가 다릅니다.')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,102 @@
+import atexit
 import random
+import threading
+from array import array
+
+# 센서 항목별 임의 값의 범위 (최솟값, 최댓값)
+ENV_RANGES = {
+    'mars_base_internal_temperature': (18, 30),
+    'mars_base_external_temperature': (0, 21),
+    'mars_base_internal_humidity': (50, 60),
+    'mars_base_external_illuminance': (500, 715),
+    'mars_base_internal_co2': (0.02, 0.1),
+    'mars_base_internal_oxygen': (4, 7)
+}
+
+LOG_PATH = 'mars_base_log.txt'
+LOG_BUFFER_SIZE = 64 * 1024  # 버퍼에 모인 문자 수가 이 값을 넘으면 파일에 기록
+LOG_FLUSH_INTERVAL = 1.0  # 백그라운드 스레드가 버퍼를 비우는 간격(초)
+
+
+class SensorLogWriter:
+    '''
+    로그 파일을 한 번만 열어 두고 메모리 버퍼에 모았다가 한꺼번에 기록하는 로그 작성기
+    버퍼가 buffer_size를 넘거나 flush_interval초가 지나면 기록하고,
+    프로그램이 종료될 때(atexit) 남은 내용을 반드시 기록한다.
+    '''
+
+    def __init__(self, path=LOG_PATH, buffer_size=LOG_BUFFER_SIZE, flush_interval=LOG_FLUSH_INTERVAL):
+        self.log_file = open(path, 'a', encoding='utf-8')
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffered = 0
+        self.lock = threading.Lock()
+        self.closed = False
+        self.stop_event = threading.Event()
+        self.flusher = threading.Thread(target=self._flush_periodically, args=(flush_interval,), daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, line):
+        with self.lock:
+            if self.closed:
+                raise ValueError('이미 닫힌 로그 작성기입니다.')
+            self.buffer.append(line)
+            self.buffered += len(line)
+            if self.buffered >= self.buffer_size:
+                self._flush_locked()
+
+    def write_reading(self, current_time, env):
+        '''센서 값 한 건을 텍스트 로그 한 줄로 기록'''
+        self.write(format_log_entry(current_time, env))
+
+    def flush(self):
+        with self.lock:
+            if not self.closed:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self.buffer:
+            self.log_file.write(''.join(self.buffer))
+            self.buffer = []
+            self.buffered = 0
+        self.log_file.flush()
+
+    def _flush_periodically(self, interval):
+        while not self.stop_event.wait(interval):
+            self.flush()
+
+    def close(self):
+        '''백그라운드 스레드를 멈추고 남은 버퍼를 기록한 뒤 파일을 닫음 (여러 번 불러도 안전)'''
+        self.stop_event.set()
+        if self.flusher is not threading.current_thread():
+            self.flusher.join()
+        with self.lock:
+            if self.closed:
+                return
+            self._flush_locked()
+            self.log_file.close()
+            self.closed = True
+        atexit.unregister(self.close)
+
+
+def format_log_entry(current_time, env):
+    return f"{current_time} - 화성 기지 내부 온도: {env['mars_base_internal_temperature']:.2f}, 화성 기지 외부 온도: {env['mars_base_external_temperature']:.2f}, 화성 기지 내부 습도: {env['mars_base_internal_humidity']:.2f}, 화성 기지 외부 광량: {env['mars_base_external_illuminance']:.2f}, 화성 기지 내부 이산화탄소 농도: {env['mars_base_internal_co2']:.2f}, 화성 기지 내부 산소 농도: {env['mars_base_internal_oxygen']:.2f}\n"
+
 
 class DummySensor:
-    def __init__(self):
+    def __init__(self, seed=None, log_writer=None):
+        self.rng = random.Random(seed)
+        # 로그 작성기를 주지 않으면 처음 get_env()를 부를 때 mars_base_log.txt에 기록하는 작성기를 만든다.
+        # generate()만 쓰는 경우에는 로그 파일, 플러시 스레드, atexit 등록이 생기지 않는다.
+        # write_reading(current_time, env)만 있으면 이진 로그 작성기 등도 사용할 수 있다.
+        self.log_writer = log_writer
         self.env_values = {
             'mars_base_internal_temperature': 0,
             'mars_base_external_temperature': 0,
@@ -11,35 +106,43 @@ class DummySensor:
             'mars_base_internal_oxygen': 0
         }
 
+    def generate(self, n):
+        '''
+        센서 값 n개를 한 번에 생성해서 항목별 array('d') 열로 반환
+        항목마다 난수를 한 번에 뽑아 배열로 만들고, self.rng를 쓰므로 seed로 재현할 수 있다.
+        '''
+        rand = self.rng.random
+        batch = {}
+        for key, (low, high) in ENV_RANGES.items():
+            span = high - low
+            batch[key] = array('d', [low + span * rand() for _ in range(n)])
+        return batch
+
     def set_env(self):
-        self.env_values['mars_base_internal_temperature'] = random.uniform(18, 30)
-        self.env_values['mars_base_external_temperature'] = random.uniform(0, 21)
-        self.env_values['mars_base_internal_humidity'] = random.uniform(50, 60)
-        self.env_values['mars_base_external_illuminance'] = random.uniform(500, 715)
-        self.env_values['mars_base_internal_co2'] = random.uniform(0.02, 0.1)
-        self.env_values['mars_base_internal_oxygen'] = random.uniform(4, 7)
+        batch = self.generate(1)
+        for key, values in batch.items():
+            self.env_values[key] = values[0]
 
     def get_random_time(self):
-        year = random.randint(2023, 2025)
-        month = random.randint(1, 12)
-        day = random.randint(1, 28)  # 월별로 다를 수 있지만, 간단히 28일로 제한
-        hour = random.randint(0, 23)
-        minute = random.randint(0, 59)
-        second = random.randint(0, 59)
+        year = self.rng.randint(2023, 2025)
+        month = self.rng.randint(1, 12)
+        day = self.rng.randint(1, 28)  # 월별로 다를 수 있지만, 간단히 28일로 제한
+        hour = self.rng.randint(0, 23)
+        minute = self.rng.randint(0, 59)
+        second = self.rng.randint(0, 59)
         
         return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:{second:02d}"
 
     def get_env(self):
         env = self.env_values
         current_time = self.get_random_time()
-        log_entry = f"{current_time} - 화성 기지 내부 온도: {env['mars_base_internal_temperature']:.2f}, 화성 기지 외부 온도: {env['mars_base_external_temperature']:.2f}, 화성 기지 내부 습도: {env['mars_base_internal_humidity']:.2f}, 화성 기지 외부 광량: {env['mars_base_external_illuminance']:.2f}, 화성 기지 내부 이산화탄소 농도: {env['mars_base_internal_co2']:.2f}, 화성 기지 내부 산소 농도: {env['mars_base_internal_oxygen']:.2f}\n"
-        
-        with open('mars_base_log.txt', 'a') as log_file:
-            log_file.write(log_entry)
-        
+        if self.log_writer is None:
+            self.log_writer = SensorLogWriter()
+        self.log_writer.write_reading(current_time, env)
         return env
 
-# 인스턴스화 및 메소드 호출
-ds = DummySensor()
-ds.set_env()
-print(ds.get_env())
+if __name__ == '__main__':
+    # 인스턴스화 및 메소드 호출
+    ds = DummySensor()
+    ds.set_env()
+    print(ds.get_env())
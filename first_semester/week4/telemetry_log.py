@@ -0,0 +1,186 @@
+import argparse
+import calendar
+import mmap
+import struct
+import threading
+import time
+from array import array
+
+from mars_mission_computer import ENV_RANGES, LOG_PATH
+
+BINARY_LOG_PATH = 'mars_base_log.bin'
+MAGIC = b'MARSTLM1'
+# 파일 헤더: 매직, 정밀도 코드, 예약(7바이트) = 16바이트
+FILE_HEADER = struct.Struct('<8sB7x')
+ENV_KEYS = list(ENV_RANGES)
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+# 레코드: int64 epoch + 센서 값 6개 (float64면 56바이트, float32면 32바이트)
+PRECISIONS = {
+    'f64': (1, struct.Struct('<q6d'), 'd'),
+    'f32': (2, struct.Struct('<q6f'), 'f'),
+}
+PRECISION_BY_CODE = {code: name for name, (code, _, _) in PRECISIONS.items()}
+
+
+def to_epoch(timestamp):
+    '''로그 timestamp 문자열을 epoch 초로 변환 (UTC로 간주)'''
+    return calendar.timegm(time.strptime(timestamp, TIMESTAMP_FORMAT))
+
+
+class BinaryTelemetryWriter:
+    '''
+    센서 값을 고정 길이 이진 레코드로 기록하는 로그 작성기
+    SensorLogWriter와 같은 write_reading(current_time, env)를 제공해 DummySensor에 바로 넣을 수 있다.
+    '''
+
+    def __init__(self, path=BINARY_LOG_PATH, precision='f64'):
+        code, self.record, _ = PRECISIONS[precision]
+        self.log_file = open(path, 'ab')
+        self.lock = threading.Lock()
+        if self.log_file.tell() == 0:
+            self.log_file.write(FILE_HEADER.pack(MAGIC, code))
+        elif read_precision(path) != precision:
+            self.log_file.close()
+            raise ValueError(f'{path}: 기존 로그와 정밀도가 다릅니다.')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_reading(self, current_time, env):
+        self.write_record(to_epoch(current_time), [env[key] for key in ENV_KEYS])
+
+    def write_record(self, epoch, values):
+        with self.lock:
+            self.log_file.write(self.record.pack(epoch, *values))
+
+    def write_batch(self, epochs, batch):
+        '''DummySensor.generate()가 만든 항목별 열과 epoch 목록을 한 번에 기록'''
+        pack = self.record.pack
+        columns = [batch[key] for key in ENV_KEYS]
+        data = b''.join(pack(epoch, *values) for epoch, values in zip(epochs, zip(*columns)))
+        with self.lock:
+            self.log_file.write(data)
+
+    def flush(self):
+        with self.lock:
+            self.log_file.flush()
+
+    def close(self):
+        with self.lock:
+            if not self.log_file.closed:
+                self.log_file.close()
+
+
+def read_precision(path):
+    with open(path, 'rb') as log_file:
+        magic, code = FILE_HEADER.unpack(log_file.read(FILE_HEADER.size))
+    if magic != MAGIC or code not in PRECISION_BY_CODE:
+        raise ValueError(f'{path}: 이진 센서 로그 형식이 아닙니다.')
+    return PRECISION_BY_CODE[code]
+
+
+class TelemetryLog:
+    '''
+    이진 센서 로그를 메모리 맵으로 열어 열 단위로 읽는 리더
+    레코드가 8바이트(f64) 또는 4바이트(f32) 단위로 정렬되어 있어
+    memoryview를 cast한 뒤 레코드 간격으로 잘라 복사 없이 열을 얻는다.
+    '''
+
+    def __init__(self, path=BINARY_LOG_PATH):
+        self.precision = read_precision(path)
+        _, self.record, self.typecode = PRECISIONS[self.precision]
+        self.log_file = open(path, 'rb')
+        self.mm = mmap.mmap(self.log_file.fileno(), 0, access=mmap.ACCESS_READ)
+        # 마지막 레코드가 쓰이는 중이면 완전한 레코드까지만 읽는다.
+        self.count = (len(self.mm) - FILE_HEADER.size) // self.record.size
+        self.data = memoryview(self.mm)[FILE_HEADER.size:FILE_HEADER.size + self.count * self.record.size]
+        self.epochs = self.data.cast('q')[::self.record.size // 8]
+        value_size = struct.calcsize(self.typecode)
+        self.words = self.data.cast(self.typecode)
+        self.stride = self.record.size // value_size
+        self.first_value = 8 // value_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.epochs.release()
+        self.words.release()
+        self.data.release()
+        self.mm.close()
+        self.log_file.close()
+
+    def column(self, key):
+        '''센서 항목 하나의 값 열 (mmap 위의 memoryview, 복사 없음)'''
+        return self.words[self.first_value + ENV_KEYS.index(key)::self.stride]
+
+    def record_at(self, i):
+        '''i번째 레코드를 (epoch, 값 튜플)로 반환'''
+        epoch, *values = self.record.unpack_from(self.data, i * self.record.size)
+        return epoch, values
+
+    def to_arrays(self):
+        '''timestamp와 각 센서 항목을 array 열로 복사해 반환'''
+        columns = {'timestamp': array('q', self.epochs)}
+        for key in ENV_KEYS:
+            columns[key] = array(self.typecode, self.column(key))
+        return columns
+
+
+def read_telemetry(path=BINARY_LOG_PATH):
+    with TelemetryLog(path) as log:
+        return log.to_arrays()
+
+
+def parse_text_log_line(line):
+    '''
+    텍스트 로그 한 줄을 (epoch, 값 목록)으로 변환
+    형식: 'YYYY-MM-DD HH:MM:SS - 라벨: 값, 라벨: 값, ...' (값 순서는 ENV_KEYS와 같음)
+    '''
+    timestamp, fields = line.rstrip('\n').split(' - ', 1)
+    values = [float(field.rsplit(': ', 1)[1]) for field in fields.split(', ')]
+    if len(values) != len(ENV_KEYS):
+        raise ValueError(f'센서 값 개수가 맞지 않습니다: {line!r}')
+    return to_epoch(timestamp), values
+
+
+def convert_text_log(text_path=LOG_PATH, binary_path=BINARY_LOG_PATH, precision='f64'):
+    '''기존 텍스트 로그를 이진 로그로 변환하고 변환한 레코드 수를 반환'''
+    count = 0
+    with open(text_path, 'r', encoding='utf-8') as text_file, \
+            BinaryTelemetryWriter(binary_path, precision) as writer:
+        for line in text_file:
+            if line.strip():
+                writer.write_record(*parse_text_log_line(line))
+                count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='텍스트 센서 로그를 이진 로그로 변환합니다.')
+    parser.add_argument('text_log', nargs='?', default=LOG_PATH, help='텍스트 로그 (기본값: %(default)s)')
+    parser.add_argument('binary_log', nargs='?', default=BINARY_LOG_PATH, help='이진 로그 (기본값: %(default)s)')
+    parser.add_argument('--precision', choices=sorted(PRECISIONS), default='f64',
+                        help='센서 값 저장 정밀도 (기본값: %(default)s)')
+    args = parser.parse_args()
+
+    try:
+        count = convert_text_log(args.text_log, args.binary_log, args.precision)
+        print(f'{count}건의 센서 값을 {args.binary_log}에 저장했습니다.')
+    except FileNotFoundError:
+        print('파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(f'변환 중 오류가 발생했습니다: {e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,19 @@ import random
 import time
 import threading
 import json
+from array import array
+
+from sliding_stats import MultiWindowStats
+
+# 센서 항목별 임의 값의 범위 (최솟값, 최댓값)
+ENV_RANGES = {
+    'mars_base_internal_temperature': (18, 30),
+    'mars_base_external_temperature': (0, 21),
+    'mars_base_internal_humidity': (50, 60),
+    'mars_base_external_illuminance': (500, 715),
+    'mars_base_internal_co2': (0.02, 0.1),
+    'mars_base_internal_oxygen': (4, 7)
+}
 
 env_values = {
     'mars_base_internal_temperature': 0,
@@ -13,16 +26,26 @@ env_values = {
 }
 
 class DummySensor:
-    def __init__(self):
+    def __init__(self, seed=None):
         self.env_values = env_values
+        self.rng = random.Random(seed)
+
+    def generate(self, n):
+        '''
+        센서 값 n개를 한 번에 생성해서 항목별 array('d') 열로 반환
+        항목마다 난수를 한 번에 뽑아 배열로 만들고, self.rng를 쓰므로 seed로 재현할 수 있다.
+        '''
+        rand = self.rng.random
+        batch = {}
+        for key, (low, high) in ENV_RANGES.items():
+            span = high - low
+            batch[key] = array('d', [low + span * rand() for _ in range(n)])
+        return batch
 
     def set_env(self):
-        self.env_values['mars_base_internal_temperature'] = random.uniform(18, 30)
-        self.env_values['mars_base_external_temperature'] = random.uniform(0, 21)
-        self.env_values['mars_base_internal_humidity'] = random.uniform(50, 60)
-        self.env_values['mars_base_external_illuminance'] = random.uniform(500, 715)
-        self.env_values['mars_base_internal_co2'] = random.uniform(0.02, 0.1)
-        self.env_values['mars_base_internal_oxygen'] = random.uniform(4, 7)
+        batch = self.generate(1)
+        for key, values in batch.items():
+            self.env_values[key] = values[0]
 
     def get_env(self):
         self.set_env()
@@ -34,6 +57,8 @@ class MissionComputer:
         self.sum_values = {key: 0 for key in self.env_values}
         self.count = 0
         self.running = True
+        # 1분, 5분, 1시간 이동 평균/최솟값/최댓값/표준편차
+        self.window_stats = MultiWindowStats(self.env_values)
 
     def get_sensor_data(self):
         ds = DummySensor()
@@ -43,6 +68,7 @@ class MissionComputer:
             for key in self.env_values:
                 self.sum_values[key] += sensor_data[key]
             self.count += 1
+            self.window_stats.update(time.monotonic(), sensor_data)
 
             print('Current Environment Data (JSON):')
             print(json.dumps(self.env_values, indent=4))
@@ -54,8 +80,15 @@ class MissionComputer:
                 self.sum_values = {key: 0 for key in self.env_values}
                 self.count = 0
 
+                print('Rolling Environment Statistics (1m / 5m / 1h, JSON):')
+                print(json.dumps(self.get_window_stats(), indent=4))
+
             time.sleep(5)
 
+    def get_window_stats(self):
+        '''항목별 1분, 5분, 1시간 이동 구간 통계를 반환'''
+        return self.window_stats.snapshot(time.monotonic())
+
     def stop_system(self):
         input('Press Enter to stop the system...')
         self.running = False
@@ -0,0 +1,107 @@
+import math
+from collections import deque
+
+# 동시에 유지할 이동 구간 (이름: 길이(초))
+DEFAULT_WINDOWS = {
+    '1m': 60,
+    '5m': 5 * 60,
+    '1h': 60 * 60,
+}
+
+
+class RollingWindow:
+    '''
+    최근 window_seconds초 동안의 값에 대한 평균, 최솟값, 최댓값, 표준편차를 유지하는 이동 구간
+    - 값은 (시각, 값) 링 버퍼(deque)에 들어가고, 구간을 벗어난 값은 앞에서부터 빠진다.
+    - 평균과 분산은 Welford 방식으로 값을 넣고 뺄 때마다 갱신한다.
+    - 최솟값/최댓값은 단조 deque로 관리한다.
+    값 하나를 넣을 때 드는 비용은 구간 길이와 관계없이 (분할 상환) O(1)이다.
+    '''
+
+    def __init__(self, window_seconds):
+        self.window_seconds = window_seconds
+        self.samples = deque()
+        self.min_candidates = deque()  # 값이 증가하는 순서
+        self.max_candidates = deque()  # 값이 감소하는 순서
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, timestamp, value):
+        self.samples.append((timestamp, value))
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        while self.min_candidates and self.min_candidates[-1][1] > value:
+            self.min_candidates.pop()
+        self.min_candidates.append((timestamp, value))
+        while self.max_candidates and self.max_candidates[-1][1] < value:
+            self.max_candidates.pop()
+        self.max_candidates.append((timestamp, value))
+
+        self.expire(timestamp)
+
+    def expire(self, now):
+        '''now 기준으로 구간을 벗어난 값을 제거'''
+        cutoff = now - self.window_seconds
+        samples = self.samples
+        while samples and samples[0][0] <= cutoff:
+            _, value = samples.popleft()
+            self._remove(value)
+        while self.min_candidates and self.min_candidates[0][0] <= cutoff:
+            self.min_candidates.popleft()
+        while self.max_candidates and self.max_candidates[0][0] <= cutoff:
+            self.max_candidates.popleft()
+
+    def _remove(self, value):
+        self.count -= 1
+        if self.count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        # 부동소수점 오차로 음수가 되지 않도록 0 아래로는 내려가지 않게 함
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+
+    def stats(self):
+        if not self.count:
+            return {'count': 0, 'mean': None, 'min': None, 'max': None, 'std': None}
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min_candidates[0][1],
+            'max': self.max_candidates[0][1],
+            'std': math.sqrt(self.m2 / self.count),
+        }
+
+
+class MultiWindowStats:
+    '''센서 항목마다 여러 길이의 이동 구간 통계를 함께 갱신'''
+
+    def __init__(self, keys, windows=None):
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        self.stats_by_key = {
+            key: {name: RollingWindow(seconds) for name, seconds in self.windows.items()}
+            for key in keys
+        }
+
+    def update(self, timestamp, values):
+        '''센서 값 한 건(dict)을 모든 항목, 모든 구간에 반영'''
+        for key, windows in self.stats_by_key.items():
+            value = values[key]
+            for window in windows.values():
+                window.add(timestamp, value)
+
+    def snapshot(self, now=None):
+        '''{항목: {구간 이름: 통계}} 형태로 현재 통계를 반환'''
+        result = {}
+        for key, windows in self.stats_by_key.items():
+            result[key] = {}
+            for name, window in windows.items():
+                if now is not None:
+                    window.expire(now)
+                result[key][name] = window.stats()
+        return result
@@ -0,0 +1,81 @@
+import math
+import queue
+
+EWMA_ALPHA = 0.05  # 지수 가중 이동 평균의 반영 비율 (클수록 최근 값에 민감)
+WARMUP_READINGS = 30  # 평균과 분산이 자리 잡기 전까지는 경보를 내지 않는 측정 수
+MIN_STD = 1e-9  # 분산이 0일 때 나눗셈을 피하기 위한 최소 표준편차
+
+# 센서 항목별 경보 조건 (방향, z-score 임계값)
+# 'high'는 평균보다 높을 때만, 'low'는 낮을 때만, 'both'는 양쪽 모두 경보를 낸다.
+DEFAULT_THRESHOLDS = {
+    'mars_base_internal_temperature': ('both', 4.0),
+    'mars_base_external_temperature': ('both', 4.0),
+    'mars_base_internal_humidity': ('both', 4.0),
+    'mars_base_external_illuminance': ('both', 5.0),
+    'mars_base_internal_co2': ('high', 3.5),
+    'mars_base_internal_oxygen': ('low', 3.5),
+}
+
+
+class AnomalyDetector:
+    '''
+    센서 항목마다 EWMA 평균/분산을 유지하며 z-score로 이상값을 찾는 온라인 탐지기
+    - 측정값 하나를 처리할 때 항목마다 상수 번의 연산만 하므로 O(1)이고 과거 값을 저장하지 않는다.
+    - z-score는 새 값을 반영하기 전의 평균/분산으로 계산하므로 급격한 변화가 자기 자신에게 묻히지 않는다.
+    - 경보는 dict로 만들어 alerts 큐에 넣는다. 큐는 다른 스레드에서 get()으로 꺼내 쓰면 된다.
+    '''
+
+    def __init__(self, thresholds=None, alpha=EWMA_ALPHA, warmup=WARMUP_READINGS, alerts=None):
+        self.thresholds = dict(thresholds or DEFAULT_THRESHOLDS)
+        self.alpha = alpha
+        self.warmup = warmup
+        self.alerts = queue.SimpleQueue() if alerts is None else alerts
+        self.count = 0
+        self.alert_count = 0
+        # 항목별 상태: [평균, 분산], 루프에서 dict 조회를 줄이기 위해 (항목, 방향, 임계값, 상태)로 묶어 둔다.
+        self.states = {key: [0.0, 0.0] for key in self.thresholds}
+        self.metrics = [
+            (key, direction, threshold, self.states[key])
+            for key, (direction, threshold) in self.thresholds.items()
+        ]
+
+    def update(self, timestamp, reading):
+        '''측정값 한 건(dict)을 반영하고, 이번에 낸 경보 수를 반환'''
+        self.count += 1
+        if self.count == 1:
+            # 첫 값으로 평균을 초기화 (0에서 시작하면 초반 평균이 크게 치우친다)
+            for key, _, _, state in self.metrics:
+                state[0] = reading[key]
+            return 0
+
+        alpha = self.alpha
+        check = self.count > self.warmup
+        raised = 0
+        for key, direction, threshold, state in self.metrics:
+            value = reading[key]
+            mean, variance = state
+            diff = value - mean
+            if check:
+                z = diff / max(math.sqrt(variance), MIN_STD)
+                if (z >= threshold and direction != 'low') or (z <= -threshold and direction != 'high'):
+                    self.alerts.put({
+                        'timestamp': timestamp,
+                        'metric': key,
+                        'value': value,
+                        'mean': mean,
+                        'z_score': z,
+                        'threshold': threshold,
+                    })
+                    raised += 1
+            increment = alpha * diff
+            state[0] = mean + increment
+            state[1] = (1 - alpha) * (variance + diff * increment)
+        self.alert_count += raised
+        return raised
+
+    def snapshot(self):
+        '''항목별 현재 EWMA 평균과 표준편차'''
+        return {
+            key: {'mean': mean, 'std': math.sqrt(variance)}
+            for key, (mean, variance) in self.states.items()
+        }
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+QUEUE_SIZE = 1000  # 수집기와 집계기 사이 큐의 최대 길이
+
+
+class AsyncAcquisition:
+    '''
+    asyncio 기반 다중 센서 수집 루프
+    - 센서마다 자신의 주기로 값을 읽는 코루틴 하나가 실행된다.
+    - 읽은 값은 asyncio.Queue를 거쳐 등록된 집계기(callback)로 전달된다.
+    - stop()을 부르면 종료 이벤트가 설정되고, 센서 코루틴은 취소되며 큐에 남은 값은 처리된 뒤 끝난다.
+    스레드를 센서마다 만들지 않으므로 한 프로세스에서 수백 개의 센서를 돌릴 수 있다.
+    '''
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.sensors = []
+        self.aggregators = []
+        self.loop = None
+        self.stop_event = None
+        self.stop_requested = False
+        self.errors = 0  # 집계기(callback)에서 발생한 예외 수
+        self.read_errors = 0  # 센서 read()에서 발생한 예외 수
+
+    def add_sensor(self, name, read, interval):
+        '''read()는 센서 값 dict를 반환하는 함수, interval은 읽는 주기(초)'''
+        self.sensors.append((name, read, interval))
+
+    def add_aggregator(self, callback):
+        '''callback(name, timestamp, reading)은 센서 값이 들어올 때마다 호출된다'''
+        self.aggregators.append(callback)
+
+    async def _poll(self, name, read, interval, queue):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            # 센서 읽기가 한 번 실패해도 이 센서의 수집이 멈추지 않도록 오류를 알리고 다음 주기에 다시 읽는다.
+            try:
+                # DummySensor는 공용 dict를 돌려주므로 다음 센서가 덮어쓰기 전에 복사해 둔다.
+                reading = dict(read())
+            except Exception as e:
+                self.read_errors += 1
+                print(f'센서 읽기 오류 ({name}): {e}')
+            else:
+                await queue.put((name, time.monotonic(), reading))
+            # 마감 시각을 누적해서 계산하므로 처리 시간만큼 주기가 밀리지 않는다.
+            deadline += interval
+            now = loop.time()
+            if deadline < now:
+                deadline += (now - deadline) // interval * interval + interval
+            await asyncio.sleep(deadline - now)
+
+    async def _dispatch(self, queue):
+        while True:
+            name, timestamp, reading = await queue.get()
+            for callback in self.aggregators:
+                # 집계기 하나가 실패해도 디스패처가 죽지 않도록 오류를 알리고 다음 값으로 넘어간다.
+                try:
+                    callback(name, timestamp, reading)
+                except Exception as e:
+                    self.errors += 1
+                    print(f'집계기 오류 ({name}): {e}')
+            queue.task_done()
+
+    async def run(self):
+        '''stop()이 불릴 때까지 모든 센서를 수집'''
+        self.stop_event = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        if self.stop_requested:
+            self.stop_event.set()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        dispatcher = asyncio.create_task(self._dispatch(queue))
+        pollers = [
+            asyncio.create_task(self._poll(name, read, interval, queue))
+            for name, read, interval in self.sensors
+        ]
+        try:
+            await self.stop_event.wait()
+        finally:
+            for task in pollers:
+                task.cancel()
+            await asyncio.gather(*pollers, return_exceptions=True)
+            if not dispatcher.done():
+                await queue.join()
+            dispatcher.cancel()
+            await asyncio.gather(dispatcher, return_exceptions=True)
+
+    def stop(self):
+        '''다른 스레드에서도 안전하게 수집을 멈춤'''
+        self.stop_requested = True
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.stop_event.set)
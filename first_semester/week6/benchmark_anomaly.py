@@ -0,0 +1,46 @@
+import argparse
+import time
+
+from anomaly_detector import AnomalyDetector
+from mars_mission_computer import ENV_RANGES, SAMPLE_INTERVAL, DummySensor
+
+TARGET_RATE = 100000  # 목표 처리량 (readings/sec)
+SPIKE_EVERY = 1000  # 이 간격마다 이산화탄소 급증과 산소 급감을 섞어 넣음
+
+
+def make_readings(count, seed):
+    '''DummySensor로 측정값을 미리 만들고 일정 간격으로 이상값을 심는다'''
+    batch = DummySensor(seed).generate(count)
+    keys = list(ENV_RANGES)
+    readings = [dict(zip(keys, values)) for values in zip(*[batch[key] for key in keys])]
+    for index in range(SPIKE_EVERY, count, SPIKE_EVERY):
+        readings[index]['mars_base_internal_co2'] = ENV_RANGES['mars_base_internal_co2'][1] * 3
+        readings[index]['mars_base_internal_oxygen'] = 0.0
+    return readings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='이상 탐지기의 초당 처리량을 측정합니다.')
+    parser.add_argument('--readings', type=int, default=500000, help='처리할 측정값 수 (기본값: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 seed (기본값: %(default)s)')
+    args = parser.parse_args()
+
+    readings = make_readings(args.readings, args.seed)
+    detector = AnomalyDetector()
+    update = detector.update
+    timestamp = time.time()
+
+    start = time.perf_counter()
+    for index, reading in enumerate(readings):
+        update(timestamp + index * SAMPLE_INTERVAL, reading)
+    elapsed = time.perf_counter() - start
+
+    rate = len(readings) / elapsed
+    print(f'{"AnomalyDetector":<28} {rate:12,.0f} readings/sec')
+    print(f'심은 이상값 {len(range(SPIKE_EVERY, args.readings, SPIKE_EVERY)) * 2}개, 경보 {detector.alert_count}개')
+    if rate < TARGET_RATE:
+        print(f'경고: 목표 처리량({TARGET_RATE:,} readings/sec)에 미치지 못합니다.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import platform
+import time
+
+from system_info import SETTING_FILE, SystemInfoCache
+
+
+def uncached_info():
+    '''기존 방식: 호출할 때마다 platform.*을 다시 부르고 setting.txt를 다시 읽음'''
+    system_info = {
+        'Operating System': platform.system(),
+        'OS Version': platform.version(),
+        'CPU Type': platform.processor(),
+        'CPU Cores': os.cpu_count(),
+        'Memory Size (GB)': round(
+            os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 ** 3), 2
+        )
+    }
+    if os.path.exists(SETTING_FILE):
+        with open(SETTING_FILE, 'r') as file:
+            settings = file.read().splitlines()
+            system_info = {key: system_info[key] for key in settings if key in system_info}
+    return json.dumps(system_info, indent=4)
+
+
+def bench(label, func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<28} {calls / elapsed:12,.0f} calls/sec')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='get_mission_computer_info 캐시 전후의 초당 호출 수를 비교합니다.')
+    parser.add_argument('--calls', type=int, default=100000, help='측정할 호출 수 (기본값: %(default)s)')
+    args = parser.parse_args()
+
+    cache = SystemInfoCache()
+    if uncached_info() != cache.to_json():
+        print('경고: 두 방식의 결과가 다릅니다.')
+    bench('매번 다시 계산', uncached_info, args.calls)
+    bench('SystemInfoCache', cache.to_json, args.calls)
+
+
+if __name__ == '__main__':
+    main()
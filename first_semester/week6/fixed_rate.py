@@ -0,0 +1,102 @@
+import math
+import time
+
+
+class FixedRateScheduler:
+    '''
+    단조 시계(monotonic) 기준의 고정 주기 스케줄러
+    매 틱의 마감 시각을 시작 시각 + k * period로 계산하므로 작업 시간이 길어져도 주기가 밀리지 않는다.
+    작업이 한 주기 이상 늦어지면 놓친 틱을 몰아서 실행하지 않고 건너뛴 뒤 그 수를 기록한다.
+    '''
+
+    def __init__(self, period, clock=time.monotonic, sleep=time.sleep):
+        self.period = period
+        self.clock = clock
+        self.sleep = sleep
+        self.ticks = 0
+        self.missed = 0
+        # 지터(실제 실행 시각 - 마감 시각) 통계, Welford 방식
+        self.jitter_mean = 0.0
+        self.jitter_m2 = 0.0
+        self.jitter_max = 0.0
+
+    def run(self, should_continue=lambda: True):
+        '''should_continue()가 참인 동안 매 틱마다 (틱 번호, 마감 시각)을 돌려주는 제너레이터'''
+        start = self.clock()
+        tick = 0
+        while should_continue():
+            deadline = start + tick * self.period
+            now = self.clock()
+            if now < deadline:
+                self.sleep(deadline - now)
+                # 기다리는 동안 종료 요청이 왔다면 틱을 실행하지 않고 끝낸다.
+                if not should_continue():
+                    return
+                now = self.clock()
+            self._record_jitter(now - deadline)
+            yield tick, deadline
+
+            # 다음 마감 시각이 이미 지났다면 그 사이의 틱은 놓친 것으로 처리
+            tick += 1
+            late = self.clock() - (start + tick * self.period)
+            if late >= self.period:
+                skipped = int(late // self.period)
+                self.missed += skipped
+                tick += skipped
+
+    def _record_jitter(self, jitter):
+        self.ticks += 1
+        delta = jitter - self.jitter_mean
+        self.jitter_mean += delta / self.ticks
+        self.jitter_m2 += delta * (jitter - self.jitter_mean)
+        self.jitter_max = max(self.jitter_max, jitter)
+
+    def stats(self):
+        '''실행한 틱 수, 놓친 틱 수, 지터(초) 평균/표준편차/최댓값'''
+        return {
+            'ticks': self.ticks,
+            'missed_ticks': self.missed,
+            'jitter_mean': self.jitter_mean,
+            'jitter_std': math.sqrt(self.jitter_m2 / self.ticks) if self.ticks else 0.0,
+            'jitter_max': self.jitter_max,
+        }
+
+
+class WallClockAverager:
+    '''
+    벽시계 기준으로 window_seconds 길이의 구간(예: 매 5분 정각)마다 평균을 내는 집계기
+    샘플 개수가 아니라 시각으로 구간을 나누므로 수집이 늦어져도 평균 구간이 어긋나지 않는다.
+    '''
+
+    def __init__(self, window_seconds):
+        self.window_seconds = window_seconds
+        self.window_start = None
+        self.sums = {}
+        self.count = 0
+
+    def add(self, timestamp, values):
+        '''
+        값을 누적하고, timestamp가 새 구간으로 넘어가면 끝난 구간의 결과
+        (구간 시작 시각, 샘플 수, 평균 dict)를 반환 (아니면 None)
+        '''
+        window_start = timestamp - timestamp % self.window_seconds
+        finished = None
+        if self.window_start is not None and window_start != self.window_start:
+            finished = self.flush()
+        if self.window_start is None:
+            self.window_start = window_start
+            self.sums = {key: 0 for key in values}
+        for key, value in values.items():
+            self.sums[key] += value
+        self.count += 1
+        return finished
+
+    def flush(self):
+        '''현재 구간의 결과를 반환하고 비움'''
+        if not self.count:
+            return None
+        result = (self.window_start, self.count, {key: total / self.count for key, total in self.sums.items()})
+        self.window_start = None
+        self.sums = {}
+        self.count = 0
+        return result
@@ -0,0 +1,103 @@
+import threading
+import time
+
+from proc_load import ProcLoadSampler
+
+MONITOR_INTERVAL = 1.0  # 부하를 측정하는 간격(초)
+HISTORY_SIZE = 3600  # 보관할 측정 결과 수 (1초 간격이면 1시간)
+TOP_PROCESSES = 5
+
+
+class RingBuffer:
+    '''크기가 고정된 링 버퍼, 가득 차면 가장 오래된 항목을 덮어쓴다'''
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = [None] * capacity
+        self.next_index = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, item):
+        self.items[self.next_index] = item
+        self.next_index = (self.next_index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def newest_first(self):
+        '''최근 항목부터 차례대로 돌려준다'''
+        for offset in range(1, self.size + 1):
+            yield self.items[(self.next_index - offset) % self.capacity]
+
+
+class LoadMonitor:
+    '''
+    백그라운드 스레드에서 주기적으로 부하를 측정해 링 버퍼에 보관하는 모니터
+    측정 항목: 전체/코어별 CPU 사용률, 메모리 사용률, 평균 부하, CPU/RSS 상위 프로세스
+    '''
+
+    def __init__(self, interval=MONITOR_INTERVAL, capacity=HISTORY_SIZE, top_n=TOP_PROCESSES):
+        self.interval = interval
+        self.top_n = top_n
+        self.sampler = ProcLoadSampler()
+        self.history = RingBuffer(capacity)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.errors = 0  # 백그라운드 측정 중 발생한 예외 수
+
+    def sample(self):
+        '''지금 부하를 측정해 기록하고 그 결과를 반환'''
+        sample = {
+            'timestamp': time.time(),
+            'cpu_percent': self.sampler.cpu_usage(),
+            'per_core_percent': self.sampler.per_core_usage(),
+            'memory_percent': self.sampler.memory_usage(),
+            'load_average': self.sampler.load_averages(),
+            'top_processes': self.sampler.top_processes(self.top_n)
+        }
+        with self.lock:
+            self.history.append(sample)
+        return sample
+
+    def _run(self):
+        # 마감 시각을 누적해서 계산하므로 측정 시간만큼 간격이 밀리지 않는다.
+        deadline = time.monotonic()
+        while True:
+            deadline += self.interval
+            if self.stop_event.wait(max(0.0, deadline - time.monotonic())):
+                return
+            # 측정이 한 번 실패해도 모니터 스레드가 죽지 않도록 오류를 알리고 다음 주기에 다시 측정한다.
+            try:
+                self.sample()
+            except Exception as e:
+                self.errors += 1
+                print(f'부하 측정 오류: {e}')
+
+    def start(self):
+        '''첫 측정은 바로 하고, 이후 측정은 백그라운드 스레드에서 진행'''
+        if self.thread is None:
+            self.stop_event.clear()
+            self.sample()
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.sampler.close()
+
+    def last(self, minutes):
+        '''최근 minutes분 동안의 측정 결과를 오래된 순서로 반환'''
+        cutoff = time.time() - minutes * 60
+        with self.lock:
+            recent = []
+            for sample in self.history.newest_first():
+                if sample['timestamp'] < cutoff:
+                    break
+                recent.append(sample)
+        recent.reverse()
+        return recent
@@ -1,10 +1,32 @@
+import asyncio
 import random
 import time
 import threading
 import json
 import platform
-import os
 import subprocess
+from array import array
+
+from anomaly_detector import AnomalyDetector
+from async_acquisition import AsyncAcquisition
+from fixed_rate import FixedRateScheduler, WallClockAverager
+from load_monitor import LoadMonitor
+from proc_load import ProcLoadSampler
+from system_info import SystemInfoCache
+from telemetry_sinks import TelemetryPipeline
+
+SAMPLE_INTERVAL = 5  # 센서 값을 읽는 주기(초)
+AVERAGE_WINDOW = 5 * 60  # 평균을 내는 벽시계 구간(초)
+
+# 센서 항목별 임의 값의 범위 (최솟값, 최댓값)
+ENV_RANGES = {
+    'mars_base_internal_temperature': (18, 30),
+    'mars_base_external_temperature': (0, 21),
+    'mars_base_internal_humidity': (50, 60),
+    'mars_base_external_illuminance': (500, 715),
+    'mars_base_internal_co2': (0.02, 0.1),
+    'mars_base_internal_oxygen': (4, 7)
+}
 
 # 환경 변수 초기화
 env_values = {
@@ -17,17 +39,27 @@ env_values = {
 }
 
 class DummySensor:
-    def __init__(self):
+    def __init__(self, seed=None):
         self.env_values = env_values
+        self.rng = random.Random(seed)
+
+    def generate(self, n):
+        '''
+        센서 값 n개를 한 번에 생성해서 항목별 array('d') 열로 반환
+        항목마다 난수를 한 번에 뽑아 배열로 만들고, self.rng를 쓰므로 seed로 재현할 수 있다.
+        '''
+        rand = self.rng.random
+        batch = {}
+        for key, (low, high) in ENV_RANGES.items():
+            span = high - low
+            batch[key] = array('d', [low + span * rand() for _ in range(n)])
+        return batch
 
     def set_env(self):
         '''환경 데이터를 임의로 설정'''
-        self.env_values['mars_base_internal_temperature'] = random.uniform(18, 30)
-        self.env_values['mars_base_external_temperature'] = random.uniform(0, 21)
-        self.env_values['mars_base_internal_humidity'] = random.uniform(50, 60)
-        self.env_values['mars_base_external_illuminance'] = random.uniform(500, 715)
-        self.env_values['mars_base_internal_co2'] = random.uniform(0.02, 0.1)
-        self.env_values['mars_base_internal_oxygen'] = random.uniform(4, 7)
+        batch = self.generate(1)
+        for key, values in batch.items():
+            self.env_values[key] = values[0]
 
     def get_env(self):
         '''환경 데이터를 반환'''
@@ -38,32 +70,33 @@ class MissionComputer:
     def __init__(self):
         # 환경 변수 초기화
         self.env_values = env_values
-        # 누적 합계와 카운터 초기화
-        self.sum_values = {key: 0 for key in self.env_values}
-        self.count = 0
+        # 5분(벽시계 기준) 구간별 평균 집계기와 샘플링 스케줄러
+        self.averager = WallClockAverager(AVERAGE_WINDOW)
+        self.scheduler = FixedRateScheduler(SAMPLE_INTERVAL)
         # 시스템 실행 상태 플래그
         self.running = True
+        # get_sensor_data_async()에서 사용하는 asyncio 수집 루프
+        self.acquisition = None
+        # 리눅스에서 사용하는 /proc 기반 부하 측정기와 부하 기록 모니터
+        self.load_sampler = None
+        self.load_monitor = None
+        # 고정 시스템 정보와 setting.txt 캐시 (처음 get_mission_computer_info()를 부를 때 생성)
+        self.system_info = None
+        # 센서 값을 배치로 내보내는 텔레메트리 싱크 (add_sink()로 등록)
+        self.telemetry = None
+        # 다른 프로세스와 최신 센서 값을 나누는 공유 메모리 센서 버스 (start_sensor_bus()로 시작)
+        self.sensor_bus = None
+        # 센서 값마다 EWMA/z-score로 이상값을 검사하는 탐지기, 경보는 self.alerts 큐로 나간다.
+        self.anomaly_detector = AnomalyDetector()
+        self.alerts = self.anomaly_detector.alerts
 
     def get_mission_computer_info(self):
         '''미션 컴퓨터의 시스템 정보를 JSON 형식으로 반환'''
         try:
-            system_info = {
-                'Operating System': platform.system(),
-                'OS Version': platform.version(),
-                'CPU Type': platform.processor(),
-                'CPU Cores': os.cpu_count(),
-                'Memory Size (GB)': round(
-                    os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 ** 3), 2
-                )
-            }
-
-            # setting.txt 파일에서 출력 항목 설정 읽기
-            if os.path.exists('setting.txt'):
-                with open('setting.txt', 'r') as file:
-                    settings = file.read().splitlines()
-                    system_info = {key: system_info[key] for key in settings if key in system_info}
-
-            return json.dumps(system_info, indent=4)
+            # 고정 정보는 한 번만 계산하고, setting.txt는 수정되었을 때만 다시 읽는다.
+            if self.system_info is None:
+                self.system_info = SystemInfoCache()
+            return self.system_info.to_json()
         except Exception as e:
             return json.dumps({'error': str(e)}, indent=4)
 
@@ -99,18 +132,12 @@ class MissionComputer:
                 mem_usage = round((used_pages / total_pages) * 100, 2)
 
             elif platform.system() == 'Linux':
-                # CPU 사용량 계산 (top 명령어 사용)
-                cpu_usage = subprocess.check_output(
-                    "top -bn1 | grep '%Cpu(s)' | awk '{print $2}'",
-                    shell=True
-                ).decode().strip()
-
-                # 메모리 사용량 계산 (free 명령어 사용)
-                mem_info = subprocess.check_output(
-                    "free -m | awk '/Mem:/ {print $3/$2 * 100.0}'",
-                    shell=True
-                ).decode().strip()
-                mem_usage = float(mem_info)
+                # /proc/stat, /proc/meminfo를 직접 읽음 (파일은 한 번만 열어 두고 재사용)
+                if self.load_sampler is None:
+                    self.load_sampler = ProcLoadSampler()
+                # CPU 사용량은 직전 호출과의 차이로 계산
+                cpu_usage = self.load_sampler.cpu_usage()
+                mem_usage = self.load_sampler.memory_usage()
 
             else:  # Windows 환경 대체 코드
                 cpu_usage = subprocess.check_output(
@@ -138,36 +165,124 @@ class MissionComputer:
         except Exception as e:
             return json.dumps({'error': str(e)}, indent=4)
 
+    def start_load_monitor(self, interval=1.0, capacity=3600):
+        '''
+        부하(전체/코어별 CPU, 메모리, 평균 부하, 상위 프로세스)를 interval초마다 측정해
+        최근 capacity개를 보관하는 모니터를 시작 (리눅스 전용)
+        '''
+        if platform.system() != 'Linux':
+            raise OSError('부하 기록 모니터는 리눅스에서만 사용할 수 있습니다.')
+        if self.load_monitor is None:
+            self.load_monitor = LoadMonitor(interval, capacity)
+            self.load_monitor.start()
+
+    def get_load_history(self, minutes=5):
+        '''최근 minutes분 동안의 부하 기록을 JSON 형식으로 반환'''
+        try:
+            if self.load_monitor is None:
+                self.start_load_monitor()
+            return json.dumps(self.load_monitor.last(minutes), indent=4)
+        except Exception as e:
+            return json.dumps({'error': str(e)}, indent=4)
+
+    def add_sink(self, sink, **options):
+        '''
+        센서 값을 내보낼 텔레메트리 싱크를 등록 (telemetry_sinks.py의 NdjsonSink, BinarySink, CsvSink, CallbackSink)
+        싱크가 하나라도 있으면 측정값마다 JSON을 예쁘게 출력하지 않고 싱크로만 내보낸다.
+        '''
+        if self.telemetry is None:
+            self.telemetry = TelemetryPipeline()
+        self.telemetry.add_sink(sink, **options)
+
+    def start_sensor_bus(self, name=None, capacity=None):
+        '''
+        센서 값을 공유 메모리 링 버퍼에도 기록하기 시작하고 버스 이름을 반환
+        다른 프로세스는 sensor_bus.SensorBusReader(이름)으로 최신/최근 값을 읽을 수 있다.
+        '''
+        # sensor_bus가 이 모듈의 ENV_RANGES를 쓰므로 순환 import를 피해 여기서 불러온다.
+        from sensor_bus import BUS_CAPACITY, BUS_NAME, SensorBusWriter
+
+        if self.sensor_bus is None:
+            self.sensor_bus = SensorBusWriter(name or BUS_NAME, capacity or BUS_CAPACITY)
+        return self.sensor_bus.name
+
     def get_sensor_data(self):
         '''센서 데이터를 수집하고 출력'''
         ds = DummySensor()
-        while self.running:
-            sensor_data = ds.get_env()
-            self.env_values = sensor_data
+        try:
+            # 고정 주기로 마감 시각에 맞춰 읽으므로 처리 시간만큼 주기가 밀리지 않는다.
+            for _ in self.scheduler.run(lambda: self.running):
+                self.handle_reading(ds.get_env())
+        finally:
+            self._close_outputs()
 
-            # 누적 합계 계산
-            for key in self.env_values:
-                self.sum_values[key] += sensor_data[key]
-            self.count += 1
+    def handle_reading(self, sensor_data, timestamp=None):
+        '''센서 값 한 건을 출력하고, 이상값을 검사하고, 벽시계 기준 5분 구간 평균을 위해 누적'''
+        self.env_values = sensor_data
+        if timestamp is None:
+            timestamp = time.time()
 
+        # 속성을 한 번만 읽어 두어, 검사와 사용 사이에 다른 곳에서 None으로 바뀌어도 안전하게 한다.
+        telemetry = self.telemetry
+        sensor_bus = self.sensor_bus
+        if telemetry is not None:
+            telemetry.emit(timestamp, sensor_data)
+        else:
             print('현재 환경 데이터 (JSON):')
             print(json.dumps(self.env_values, indent=4))
 
-            if self.count % 60 == 0:  # 매 5분마다 평균 출력 (5초 간격 * 60회 반복)
-                avg_values = {key: self.sum_values[key] / self.count for key in self.env_values}
-                print('지난 5분간 평균 환경 데이터 (JSON):')
-                print(json.dumps(avg_values, indent=4))
-                
-                # 누적 합계 및 카운터 초기화
-                self.sum_values = {key: 0 for key in self.env_values}
-                self.count = 0
+        if sensor_bus is not None:
+            sensor_bus.publish(timestamp, sensor_data)
+        self.anomaly_detector.update(timestamp, sensor_data)
+
+        finished = self.averager.add(timestamp, sensor_data)
+        if finished is not None:  # 5분 구간이 끝날 때마다 평균 출력
+            _, count, avg_values = finished
+            print(f'지난 5분간 평균 환경 데이터 ({count}회 측정, JSON):')
+            print(json.dumps(avg_values, indent=4))
+            print('샘플링 주기 통계 (JSON):')
+            print(json.dumps(self.scheduler.stats(), indent=4))
+
+    def get_sensor_data_async(self, sensors=None):
+        '''
+        asyncio로 여러 센서를 각자의 주기로 수집
+        sensors는 {이름: (센서, 주기(초))}이며, 주지 않으면 DummySensor 하나를 5초마다 읽는다.
+        stop_system()이 불리면 종료된다.
+        '''
+        if sensors is None:
+            sensors = {'dummy': (DummySensor(), SAMPLE_INTERVAL)}
+        self.acquisition = AsyncAcquisition()
+        for name, (sensor, interval) in sensors.items():
+            self.acquisition.add_sensor(name, sensor.get_env, interval)
+        self.acquisition.add_aggregator(lambda name, timestamp, reading: self.handle_reading(reading))
+        if not self.running:
+            self.acquisition.stop()
+        try:
+            asyncio.run(self.acquisition.run())
+        finally:
+            self._close_outputs()
 
-            time.sleep(5)
+    def _close_outputs(self):
+        '''수집 루프가 끝난 뒤 텔레메트리 싱크(남은 값을 모두 내보냄)와 센서 버스를 닫음'''
+        if self.telemetry is not None:
+            self.telemetry.close()
+            self.telemetry = None
+        if self.sensor_bus is not None:
+            self.sensor_bus.close()
+            self.sensor_bus = None
 
     def stop_system(self):
-        '''사용자가 입력하면 시스템 종료'''
+        '''
+        사용자가 입력하면 시스템 종료
+        수집 루프에는 멈추라는 신호만 보내고, 싱크와 센서 버스는 루프가 끝난 뒤 수집 쪽에서 닫는다.
+        '''
         input('Enter 키를 눌러 시스템을 종료하세요...')
         self.running = False
+        if self.acquisition is not None:
+            self.acquisition.stop()
+        if self.load_monitor is not None:
+            self.load_monitor.stop()
+            self.load_monitor = None
         print('시스템이 종료되었습니다.')
 
 if __name__ == '__main__':
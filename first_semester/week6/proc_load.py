@@ -0,0 +1,169 @@
+import heapq
+import os
+import time
+
+PROC_STAT = '/proc/stat'
+PROC_MEMINFO = '/proc/meminfo'
+PROC_DIR = '/proc'
+READ_SIZE = 64 * 1024
+
+
+def read_proc(fd):
+    '''열어 둔 /proc 파일을 처음부터 다시 읽음 (pread 한 번, 부족하면 버퍼를 늘려 재시도)'''
+    size = READ_SIZE
+    while True:
+        data = os.pread(fd, size, 0)
+        if len(data) < size:
+            return data
+        size *= 2
+
+
+def parse_cpu_times(line):
+    '''
+    /proc/stat의 cpu 줄을 (전체 시간, 유휴 시간)으로 변환
+    user nice system idle iowait irq softirq steal (guest는 user에 이미 포함)
+    '''
+    fields = [int(field) for field in line.split()[1:9]]
+    idle = fields[3] + fields[4]
+    return sum(fields), idle
+
+
+def cpu_percent(previous, current):
+    '''두 시점의 (전체, 유휴) 시간 차이로 CPU 사용률(%)을 계산'''
+    total = current[0] - previous[0]
+    idle = current[1] - previous[1]
+    if total <= 0:
+        return 0.0
+    return round((total - idle) / total * 100, 2)
+
+
+class ProcLoadSampler:
+    '''
+    /proc/stat과 /proc/meminfo를 직접 읽는 리눅스 전용 부하 측정기
+    파일은 한 번만 열어 두고 매번 pread로 다시 읽으므로 외부 프로세스를 띄우지 않고
+    초당 10회 이상 호출해도 부담이 거의 없다.
+    CPU 사용률은 직전 호출과의 차이로 계산하며, 첫 호출은 부팅 이후 평균이다.
+    '''
+
+    def __init__(self):
+        # os.sysconf는 윈도우에 없으므로 모듈을 불러올 때가 아니라 측정기를 만들 때 읽는다.
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+        self.stat_fd = os.open(PROC_STAT, os.O_RDONLY)
+        self.meminfo_fd = os.open(PROC_MEMINFO, os.O_RDONLY)
+        self.previous_cpu = (0, 0)
+        self.previous_cores = {}
+        # 프로세스별 직전 CPU 시간(tick)과 측정 시각
+        self.previous_process_ticks = {}
+        self.previous_process_time = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for fd in (self.stat_fd, self.meminfo_fd):
+            if fd is not None:
+                os.close(fd)
+        self.stat_fd = self.meminfo_fd = None
+
+    def read_cpu_times(self):
+        data = read_proc(self.stat_fd)
+        return parse_cpu_times(data[:data.index(b'\n')].decode())
+
+    def cpu_usage(self):
+        current = self.read_cpu_times()
+        usage = cpu_percent(self.previous_cpu, current)
+        self.previous_cpu = current
+        return usage
+
+    def per_core_usage(self):
+        '''코어별 CPU 사용률(%)을 {'cpu0': 12.5, ...} 형태로 반환'''
+        usage = {}
+        for line in read_proc(self.stat_fd).decode().splitlines()[1:]:
+            if not line.startswith('cpu'):
+                break  # cpu 줄은 파일 앞부분에 모여 있다.
+            name = line.split(None, 1)[0]
+            current = parse_cpu_times(line)
+            usage[name] = cpu_percent(self.previous_cores.get(name, (0, 0)), current)
+            self.previous_cores[name] = current
+        return usage
+
+    def load_averages(self):
+        '''1분, 5분, 15분 평균 부하'''
+        one, five, fifteen = os.getloadavg()
+        return {'1m': one, '5m': five, '15m': fifteen}
+
+    def read_processes(self):
+        '''실행 중인 프로세스마다 (pid, 이름, 누적 CPU tick, RSS 바이트)를 돌려주는 제너레이터'''
+        for entry in os.scandir(PROC_DIR):
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f'{PROC_DIR}/{entry.name}/stat', 'rb') as stat_file:
+                    data = stat_file.read().decode(errors='replace')
+            except OSError:
+                continue  # 읽는 사이에 종료된 프로세스
+            try:
+                # 이름(comm)에 공백이나 괄호가 있을 수 있으므로 마지막 ')' 기준으로 나눈다.
+                name = data[data.index('(') + 1:data.rindex(')')]
+                fields = data[data.rindex(')') + 2:].split()
+                # fields[0]이 state(3번째 항목): utime=14, stime=15, rss=24번째 항목
+                ticks = int(fields[11]) + int(fields[12])
+                rss = int(fields[21]) * self.page_size
+            except (ValueError, IndexError):
+                continue  # 비어 있거나 형식이 예상과 다른 stat
+            yield int(entry.name), name, ticks, rss
+
+    def top_processes(self, n=5):
+        '''
+        CPU 사용률과 메모리(RSS) 기준 상위 n개 프로세스
+        CPU 사용률은 직전 호출 이후 사용한 CPU 시간을 경과 시간으로 나눈 값(한 코어 = 100%)이다.
+        '''
+        now = time.monotonic()
+        elapsed = now - self.previous_process_time if self.previous_process_time else None
+        processes = []
+        current_ticks = {}
+        for pid, name, ticks, rss in self.read_processes():
+            current_ticks[pid] = ticks
+            previous = self.previous_process_ticks.get(pid)
+            if elapsed and previous is not None:
+                cpu = (ticks - previous) / self.clock_ticks / elapsed * 100
+            else:
+                cpu = 0.0
+            processes.append({
+                'pid': pid,
+                'name': name,
+                'cpu_percent': round(cpu, 2),
+                'rss_mb': round(rss / (1024 ** 2), 2)
+            })
+        # 종료된 프로세스는 버리고 지금 살아 있는 프로세스만 기억한다.
+        self.previous_process_ticks = current_ticks
+        self.previous_process_time = now
+        return {
+            'by_cpu': heapq.nlargest(n, processes, key=lambda process: process['cpu_percent']),
+            'by_rss': heapq.nlargest(n, processes, key=lambda process: process['rss_mb'])
+        }
+
+    def read_meminfo(self):
+        '''/proc/meminfo를 {항목: kB} dict로 반환'''
+        meminfo = {}
+        for line in read_proc(self.meminfo_fd).decode().splitlines():
+            key, _, value = line.partition(':')
+            meminfo[key] = int(value.split()[0])
+        return meminfo
+
+    def memory_usage(self):
+        '''사용 중인 메모리 비율(%), 사용 가능 메모리(MemAvailable)를 뺀 양 기준'''
+        meminfo = self.read_meminfo()
+        total = meminfo['MemTotal']
+        available = meminfo.get('MemAvailable', meminfo['MemFree'])
+        return round((total - available) / total * 100, 2)
+
+    def sample(self):
+        return {
+            'CPU Usage (%)': self.cpu_usage(),
+            'Memory Usage (%)': self.memory_usage()
+        }
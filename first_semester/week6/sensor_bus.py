@@ -0,0 +1,215 @@
+import argparse
+import atexit
+import json
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+from mars_mission_computer import ENV_RANGES
+
+BUS_NAME = 'mars_sensor_bus'
+BUS_CAPACITY = 4096  # 보관할 최근 측정값 수
+MAGIC = b'MARSBUS1'
+ENV_KEYS = list(ENV_RANGES)
+# 헤더: 매직, 용량, 레코드 크기, 지금까지 기록한 레코드 수 (64바이트로 맞춤)
+HEADER = struct.Struct('<8sIIQ')
+HEADER_SIZE = 64
+COUNT_OFFSET = 16
+COUNT = struct.Struct('<Q')
+# 레코드: 시작 순번, timestamp, 센서 값 6개, 끝 순번 (72바이트)
+RECORD = struct.Struct('<Qd6dQ')
+VALUES = struct.Struct('<d6d')
+VALUES_OFFSET = COUNT.size
+END_OFFSET = VALUES_OFFSET + VALUES.size
+
+
+def untrack(shm):
+    '''
+    파이썬 3.12 이하에서는 공유 메모리를 만들거나 연결만 해도 resource_tracker에 등록되어,
+    그 프로세스가 끝날 때 다른 프로세스가 아직 쓰는 공유 메모리까지 지워 버린다.
+    그래서 등록을 바로 취소하고, 지우는 일은 작성자의 close()가 직접 맡는다.
+    '''
+    if os.name == 'posix':
+        resource_tracker.unregister(shm._name, 'shared_memory')
+
+
+def remove_stale(name):
+    '''
+    비정상 종료된 작성자가 남긴 공유 메모리를 지움
+    이미 연결해 둔 읽는 쪽은 매핑한 메모리를 계속 읽을 수 있고, 새로 연결하는 쪽은 새 버스를 본다.
+    '''
+    # 연결할 때 resource_tracker에 등록되고 unlink()가 등록을 취소하므로 짝이 맞는다.
+    stale = shared_memory.SharedMemory(name=name)
+    stale.close()
+    stale.unlink()
+
+
+class SensorBusWriter:
+    '''
+    공유 메모리 위의 단일 작성자 링 버퍼
+    - 레코드는 고정 길이(RECORD)이며 n번째 측정값은 n % capacity 칸에 들어간다.
+    - 칸의 앞뒤에 같은 순번을 적는다. 작성자는 앞 순번 -> 값 -> 끝 순번 순서로 쓰고, 읽는 쪽은
+      끝 순번 -> 값 -> 앞 순번 순서로 읽어 두 순번이 같을 때만 온전한 레코드로 본다 (seqlock).
+      작성자 한 명만 쓰므로 락이 필요 없다.
+    - 헤더의 기록 수는 레코드를 다 쓴 뒤에 늘린다.
+    - 작성자가 close() 없이 비정상 종료(SIGKILL 등)되면 같은 이름의 공유 메모리가 남는다.
+      작성자는 한 명뿐이라고 보고, 새 작성자는 남아 있는 공유 메모리를 지운 뒤 새로 만든다.
+    '''
+
+    def __init__(self, name=BUS_NAME, capacity=BUS_CAPACITY):
+        self.capacity = capacity
+        size = HEADER_SIZE + capacity * RECORD.size
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            remove_stale(name)
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        untrack(self.shm)
+        HEADER.pack_into(self.buf, 0, MAGIC, capacity, RECORD.size, 0)
+        self.count = 0
+        # 종료할 때 close()를 잊어도 공유 메모리가 남지 않도록 함
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def publish(self, timestamp, reading):
+        '''센서 값 한 건(dict)을 다음 칸에 기록하고 순번(1부터)을 반환'''
+        sequence = self.count + 1
+        offset = HEADER_SIZE + (sequence - 1) % self.capacity * RECORD.size
+        buf = self.buf
+        COUNT.pack_into(buf, offset, sequence)
+        VALUES.pack_into(buf, offset + VALUES_OFFSET, timestamp, *[reading[key] for key in ENV_KEYS])
+        COUNT.pack_into(buf, offset + END_OFFSET, sequence)
+        COUNT.pack_into(buf, COUNT_OFFSET, sequence)
+        self.count = sequence
+        return sequence
+
+    def close(self):
+        '''공유 메모리를 닫고 지움 (연결해 둔 읽는 쪽은 이미 매핑한 메모리를 계속 읽을 수 있다)'''
+        if self.shm is not None:
+            self.buf = None
+            self.shm.close()
+            if os.name == 'posix':
+                # unlink()가 등록 취소를 한 번 더 하므로 짝을 맞춰 다시 등록해 둔다.
+                resource_tracker.register(self.shm._name, 'shared_memory')
+            self.shm.unlink()
+            self.shm = None
+            atexit.unregister(self.close)
+
+
+class SensorBusReader:
+    '''
+    다른 프로세스(대시보드, 로거, 이상 탐지기 등)에서 센서 버스를 읽는 쪽
+    공유 메모리에서 바로 unpack하므로 피클링이나 프로세스 간 복사가 없다.
+    읽는 도중 작성자가 같은 칸을 덮어쓰면 그 레코드는 건너뛰고 overruns에 센다.
+    '''
+
+    def __init__(self, name=BUS_NAME):
+        self.shm = shared_memory.SharedMemory(name=name)
+        untrack(self.shm)
+        self.buf = self.shm.buf
+        magic, self.capacity, record_size, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f'{name}: 센서 버스 형식이 아닙니다.')
+        self.last_sequence = 0
+        self.overruns = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.shm is not None:
+            self.buf = None
+            self.shm.close()
+            self.shm = None
+
+    def written(self):
+        '''작성자가 지금까지 기록한 레코드 수'''
+        return COUNT.unpack_from(self.buf, COUNT_OFFSET)[0]
+
+    def read(self, sequence):
+        '''sequence번째 레코드를 (순번, timestamp, 센서 값 dict)로 반환, 이미 덮어쓰였으면 None'''
+        offset = HEADER_SIZE + (sequence - 1) % self.capacity * RECORD.size
+        buf = self.buf
+        if COUNT.unpack_from(buf, offset + END_OFFSET)[0] != sequence:
+            return None
+        timestamp, *values = VALUES.unpack_from(buf, offset + VALUES_OFFSET)
+        # 값을 읽는 동안 작성자가 이 칸을 덮어쓰기 시작했다면 앞 순번이 바뀌어 있다.
+        if COUNT.unpack_from(buf, offset)[0] != sequence:
+            return None
+        return sequence, timestamp, dict(zip(ENV_KEYS, values))
+
+    def latest(self):
+        '''가장 최근 측정값, 아직 없으면 None'''
+        sequence = self.written()
+        while sequence:
+            record = self.read(sequence)
+            if record is not None:
+                return record
+            sequence = self.written()  # 읽는 사이에 새 값이 들어왔으면 다시 시도
+        return None
+
+    def recent(self, n):
+        '''최근 n개 측정값을 오래된 순서로 반환 (링 버퍼 용량까지)'''
+        newest = self.written()
+        first = max(1, newest - min(n, self.capacity) + 1)
+        records = (self.read(sequence) for sequence in range(first, newest + 1))
+        return [record for record in records if record is not None]
+
+    def poll(self):
+        '''
+        직전 poll() 이후 새로 들어온 측정값을 모두 반환
+        너무 늦게 읽어 링 버퍼가 한 바퀴 이상 돌았다면 놓친 수를 overruns에 더한다.
+        '''
+        newest = self.written()
+        first = self.last_sequence + 1
+        if newest - first + 1 > self.capacity:
+            self.overruns += newest - self.capacity - first + 1
+            first = newest - self.capacity + 1
+        records = []
+        for sequence in range(first, newest + 1):
+            record = self.read(sequence)
+            if record is None:
+                self.overruns += 1
+            else:
+                records.append(record)
+        self.last_sequence = newest
+        return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description='공유 메모리 센서 버스의 최신 값을 다른 프로세스에서 읽어 출력합니다.')
+    parser.add_argument('--name', default=BUS_NAME, help='센서 버스 이름 (기본값: %(default)s)')
+    parser.add_argument('--interval', type=float, default=1.0, help='읽는 간격(초) (기본값: %(default)s)')
+    parser.add_argument('--once', action='store_true', help='최신 값을 한 번만 출력하고 종료')
+    args = parser.parse_args()
+
+    try:
+        with SensorBusReader(args.name) as reader:
+            while True:
+                record = reader.latest()
+                if record is not None:
+                    sequence, timestamp, reading = record
+                    print(json.dumps({'sequence': sequence, 'timestamp': timestamp, **reading}, indent=4))
+                if args.once:
+                    break
+                time.sleep(args.interval)
+    except FileNotFoundError:
+        print(f'센서 버스를 찾을 수 없습니다: {args.name}')
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+import argparse
+import calendar
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from array import array
+
+from mars_mission_computer import ENV_RANGES, SAMPLE_INTERVAL, DummySensor, MissionComputer
+from telemetry_sinks import CallbackSink
+
+try:
+    import resource  # 최대 RSS 측정용 (유닉스 전용)
+except ImportError:
+    resource = None
+
+ENV_KEYS = list(ENV_RANGES)
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+SYNTHETIC_CHUNK = 1000  # 합성 데이터를 한 번에 생성하는 개수
+MAX_GAP = 60.0  # 재생할 때 두 측정값 사이에 기다리는 최대 시간(초, 기록 기준)
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def parse_log_line(line):
+    '''
+    week4 mars_base_log.txt 한 줄을 (epoch, 센서 값 dict)로 변환
+    형식: 'YYYY-MM-DD HH:MM:SS - 라벨: 값, 라벨: 값, ...' (값 순서는 ENV_RANGES와 같음)
+    '''
+    timestamp, fields = line.rstrip('\n').split(' - ', 1)
+    values = [float(field.rsplit(': ', 1)[1]) for field in fields.split(', ')]
+    if len(values) != len(ENV_KEYS):
+        raise ValueError(f'센서 값 개수가 맞지 않습니다: {line!r}')
+    epoch = calendar.timegm(time.strptime(timestamp, TIMESTAMP_FORMAT))
+    return epoch, dict(zip(ENV_KEYS, values))
+
+
+def iter_log_file(path):
+    '''로그 파일을 한 줄씩 읽어 (epoch, 센서 값)을 돌려주는 제너레이터 (파일 전체를 메모리에 올리지 않음)'''
+    with open(path, 'r', encoding='utf-8') as log_file:
+        for line in log_file:
+            if line.strip():
+                yield parse_log_line(line)
+
+
+def log_span(path):
+    '''로그에 기록된 가장 이른 시각과 가장 늦은 시각의 차이(초), 시각 부분만 읽어 계산'''
+    earliest = latest = None
+    with open(path, 'r', encoding='utf-8') as log_file:
+        for line in log_file:
+            if not line.strip():
+                continue
+            epoch = calendar.timegm(time.strptime(line.split(' - ', 1)[0], TIMESTAMP_FORMAT))
+            if earliest is None or epoch < earliest:
+                earliest = epoch
+            if latest is None or epoch > latest:
+                latest = epoch
+    return 0 if earliest is None else latest - earliest
+
+
+def iter_log_readings(path, repeat=1):
+    '''
+    기록된 로그를 (epoch, 센서 값) 순서로 돌려주는 제너레이터
+    repeat번 반복하며 매번 파일을 다시 열어 스트리밍으로 읽는다.
+    반복할 때마다 시각을 로그 길이만큼 뒤로 밀어 새 측정값처럼 보이게 한다 (길이는 처음에 한 번 훑어 계산).
+    '''
+    span = log_span(path) + SAMPLE_INTERVAL if repeat > 1 else 0
+    for index in range(repeat):
+        shift = index * span
+        for epoch, reading in iter_log_file(path):
+            yield epoch + shift, reading
+
+
+def iter_synthetic_readings(count, seed=None, start=None, interval=SAMPLE_INTERVAL):
+    '''DummySensor.generate()로 센서 값 count개를 interval초 간격의 시각과 함께 만든다'''
+    sensor = DummySensor(seed)
+    timestamp = time.time() if start is None else start
+    remaining = count
+    while remaining > 0:
+        size = min(SYNTHETIC_CHUNK, remaining)
+        batch = sensor.generate(size)
+        columns = [batch[key] for key in ENV_KEYS]
+        for values in zip(*columns):
+            yield timestamp, dict(zip(ENV_KEYS, values))
+            timestamp += interval
+        remaining -= size
+
+
+def percentiles(samples):
+    '''지연 시간 표본(초)의 백분위수와 최댓값을 밀리초로 반환'''
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {}
+    for percent in PERCENTILES:
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        result[f'p{percent:g}'] = round(ordered[index] * 1000, 4)
+    result['max'] = round(ordered[-1] * 1000, 4)
+    return result
+
+
+class ReplayHarness:
+    '''
+    기록된/합성 센서 값을 MissionComputer.handle_reading()에 원하는 배속으로 넣는 재생기
+    - speed가 1이면 기록된 간격 그대로, 10이면 10배 빠르게, 0(또는 None)이면 기다리지 않고 최대 속도로 넣는다.
+    - 단계별 지연 시간: source(값 읽기/파싱), handle_reading(평균 집계 등), sink(싱크 전달까지), pacing(예정 시각 대비 늦음)
+    - 지연 시간 표본은 array('d')에 모아 측정 자체가 쓰는 메모리를 줄인다.
+    '''
+
+    def __init__(self, computer=None, speed=0, max_gap=MAX_GAP):
+        self.computer = MissionComputer() if computer is None else computer
+        self.speed = speed
+        self.max_gap = max_gap
+        self.latency = {stage: array('d') for stage in ('source', 'handle_reading', 'sink', 'pacing')}
+        # 측정값 순번(1부터) -> 보낸 시각, 기록 시각이 겹쳐도 섞이지 않도록 순번으로 구분한다.
+        self.emitted_at = {}
+        self.delivered = 0
+        self.sink_stats = []
+        # 싱크까지 걸린 시간을 재기 위해 아무 일도 하지 않는 콜백 싱크를 하나 붙인다.
+        # 이 싱크의 큐는 크기 제한이 없어 버려지는 값이 없으므로, n번째로 도착한 값이 곧 n번째로 보낸 값이다.
+        self.computer.add_sink(CallbackSink(self._on_batch), queue_size=None)
+
+    def _on_batch(self, records):
+        now = time.perf_counter()
+        sink_latency = self.latency['sink']
+        for _ in records:
+            self.delivered += 1
+            sink_latency.append(now - self.emitted_at.pop(self.delivered))
+
+    def run(self, readings):
+        '''readings는 (epoch, 센서 값) 이터러블, 처리한 측정값 수와 경과 시간(초)을 반환'''
+        latency_source = self.latency['source']
+        latency_handle = self.latency['handle_reading']
+        latency_pacing = self.latency['pacing']
+        handle_reading = self.computer.handle_reading
+        perf_counter = time.perf_counter
+        paced = bool(self.speed)
+
+        iterator = iter(readings)
+        count = 0
+        replay_offset = 0.0  # 첫 측정값 이후 기록상 경과 시간 (최대 간격 제한 적용)
+        previous_epoch = None
+        start = perf_counter()
+        while True:
+            before = perf_counter()
+            try:
+                epoch, reading = next(iterator)
+            except StopIteration:
+                break
+            after = perf_counter()
+            latency_source.append(after - before)
+
+            if paced:
+                # 기록상 시각이 거꾸로 가거나 너무 오래 비면 간격을 0 ~ max_gap으로 제한한다.
+                if previous_epoch is not None:
+                    replay_offset += min(max(epoch - previous_epoch, 0), self.max_gap)
+                previous_epoch = epoch
+                due = start + replay_offset / self.speed
+                if after < due:
+                    time.sleep(due - after)
+                    after = perf_counter()
+                latency_pacing.append(after - due)
+
+            count += 1
+            self.emitted_at[count] = after
+            handle_reading(reading, epoch)
+            latency_handle.append(perf_counter() - after)
+
+        # 싱크 큐에 남은 값을 모두 내보낸 뒤 종료
+        self.sink_stats = self.computer.telemetry.stats()
+        self.computer.telemetry.close()
+        self.computer.telemetry = None
+        self.emitted_at.clear()
+        return count, perf_counter() - start
+
+    def report(self, count, elapsed):
+        report = {
+            'readings': count,
+            'elapsed_sec': round(elapsed, 4),
+            'throughput_per_sec': round(count / elapsed, 1) if elapsed else None,
+            'speed': self.speed or 'max',
+            'latency_ms': {stage: percentiles(samples) for stage, samples in self.latency.items() if samples},
+            'sinks': self.sink_stats,
+        }
+        if resource is not None:
+            # 리눅스에서 ru_maxrss는 kB 단위
+            report['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='센서 값을 배속으로 재생해 MissionComputer의 처리 성능을 측정합니다.')
+    parser.add_argument('--log', help='재생할 week4 형식 텍스트 로그 (주지 않으면 DummySensor 합성 데이터 사용)')
+    parser.add_argument('--repeat', type=int, default=1, help='로그를 반복 재생할 횟수 (기본값: %(default)s)')
+    parser.add_argument('--count', type=int, default=100000, help='합성 센서 값 수 (기본값: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='합성 데이터 난수 seed (기본값: %(default)s)')
+    parser.add_argument('--speed', type=float, default=0,
+                        help='재생 배속, 1은 실제 시간, 0은 최대 속도 (기본값: %(default)s)')
+    parser.add_argument('--max-gap', type=float, default=MAX_GAP,
+                        help='재생할 때 측정값 사이에 기다리는 최대 기록 간격(초) (기본값: %(default)s)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='tracemalloc으로 파이썬 메모리 최대 사용량을 측정 (처리 속도는 느려짐)')
+    parser.add_argument('--verbose', action='store_true', help='MissionComputer의 평균 출력을 그대로 표시')
+    args = parser.parse_args()
+
+    try:
+        if args.log:
+            readings = iter_log_readings(args.log, args.repeat)
+        else:
+            readings = iter_synthetic_readings(args.count, args.seed)
+
+        if args.trace_memory:
+            tracemalloc.start()
+        harness = ReplayHarness(speed=args.speed, max_gap=args.max_gap)
+        with open(os.devnull, 'w') as devnull:
+            # 5분 평균 출력이 측정을 방해하지 않도록 기본적으로 버린다.
+            output = sys.stdout if args.verbose else devnull
+            with contextlib.redirect_stdout(output):
+                count, elapsed = harness.run(readings)
+        report = harness.report(count, elapsed)
+        if args.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report['python_peak_mb'] = round(peak / (1024 ** 2), 2)
+        print(json.dumps(report, indent=4))
+    except FileNotFoundError:
+        print(f'파일을 찾을 수 없습니다: {args.log}')
+    except ValueError as e:
+        print(f'로그 형식이 올바르지 않습니다: {e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import json
+import os
+import platform
+
+SETTING_FILE = 'setting.txt'
+
+
+def collect_static_info():
+    '''실행 중에 바뀌지 않는 호스트 정보 (시작할 때 한 번만 계산)'''
+    return {
+        'Operating System': platform.system(),
+        'OS Version': platform.version(),
+        'CPU Type': platform.processor(),
+        'CPU Cores': os.cpu_count(),
+        'Memory Size (GB)': round(
+            os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 ** 3), 2
+        )
+    }
+
+
+class SystemInfoCache:
+    '''
+    get_mission_computer_info()용 캐시
+    - platform.* 등 고정 정보는 생성할 때 한 번만 계산한다.
+    - setting.txt는 수정 시각(mtime)이나 크기가 바뀌었을 때만 다시 읽는다.
+    - 출력할 JSON 문자열도 설정이 바뀌기 전까지 재사용하므로 보통은 stat 한 번으로 끝난다.
+    '''
+
+    def __init__(self, setting_path=SETTING_FILE):
+        self.setting_path = setting_path
+        self.static_info = collect_static_info()
+        self.setting_signature = None
+        self.cached_json = None
+
+    def read_signature(self):
+        '''설정 파일의 (mtime_ns, 크기), 파일이 없으면 None'''
+        try:
+            stat = os.stat(self.setting_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def load_settings(self):
+        '''setting.txt에 적힌 출력 항목 목록 (파일이 없으면 None)'''
+        try:
+            with open(self.setting_path, 'r') as file:
+                return file.read().splitlines()
+        except FileNotFoundError:
+            return None
+
+    def to_json(self):
+        signature = self.read_signature()
+        if self.cached_json is None or signature != self.setting_signature:
+            system_info = self.static_info
+            settings = self.load_settings() if signature is not None else None
+            if settings is not None:
+                system_info = {key: system_info[key] for key in settings if key in system_info}
+            self.cached_json = json.dumps(system_info, indent=4)
+            self.setting_signature = signature
+        return self.cached_json
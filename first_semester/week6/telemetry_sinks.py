@@ -0,0 +1,232 @@
+import csv
+import io
+import json
+import struct
+import threading
+import time
+from collections import deque
+
+BATCH_SIZE = 256  # 한 번에 직렬화해서 내보낼 최대 측정값 수
+QUEUE_SIZE = 10000  # 싱크마다 쌓아 둘 수 있는 최대 측정값 수 (넘치면 가장 오래된 값부터 버림)
+FLUSH_INTERVAL = 1.0  # 배치가 다 차지 않아도 내보내는 간격(초)
+
+# week4 telemetry_log.py와 같은 이진 형식 (헤더 16바이트 + 레코드: int64 epoch + 센서 값 6개)
+MAGIC = b'MARSTLM1'
+FILE_HEADER = struct.Struct('<8sB7x')
+PRECISIONS = {
+    'f64': (1, struct.Struct('<q6d')),
+    'f32': (2, struct.Struct('<q6f')),
+}
+PRECISION_BY_CODE = {code: name for name, (code, _) in PRECISIONS.items()}
+
+
+def read_precision(path):
+    '''이진 텔레메트리 파일 헤더의 정밀도('f64' 또는 'f32')'''
+    with open(path, 'rb') as log_file:
+        header = log_file.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size:
+        raise ValueError(f'{path}: 이진 텔레메트리 로그가 아닙니다.')
+    magic, code = FILE_HEADER.unpack(header)
+    if magic != MAGIC or code not in PRECISION_BY_CODE:
+        raise ValueError(f'{path}: 이진 텔레메트리 로그가 아닙니다.')
+    return PRECISION_BY_CODE[code]
+
+
+class TelemetrySink:
+    '''
+    측정값 배치를 받아 한 번에 직렬화해서 내보내는 싱크의 기본 클래스
+    records는 (timestamp, reading dict) 목록이다.
+    '''
+
+    def write_batch(self, records):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class NdjsonSink(TelemetrySink):
+    '''한 줄에 측정값 하나씩, 공백 없는 JSON으로 기록 (newline-delimited JSON)'''
+
+    def __init__(self, path):
+        self.file = open(path, 'a', encoding='utf-8')
+        self.encode = json.JSONEncoder(separators=(',', ':')).encode
+
+    def write_batch(self, records):
+        encode = self.encode
+        lines = [encode({'timestamp': timestamp, **reading}) for timestamp, reading in records]
+        self.file.write('\n'.join(lines) + '\n')
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class BinarySink(TelemetrySink):
+    '''week4 telemetry_log.py의 고정 길이 이진 레코드 형식으로 기록 (TelemetryLog로 읽을 수 있음)'''
+
+    def __init__(self, path, keys, precision='f64'):
+        code, self.record = PRECISIONS[precision]
+        self.keys = list(keys)
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(MAGIC, code))
+            return
+        # 정밀도가 다른 레코드를 이어 쓰면 파일 전체를 읽을 수 없게 되므로 기존 헤더를 확인한다.
+        try:
+            existing = read_precision(path)
+        except ValueError:
+            self.file.close()
+            raise
+        if existing != precision:
+            self.file.close()
+            raise ValueError(f'{path}: 기존 로그와 정밀도가 다릅니다.')
+
+    def write_batch(self, records):
+        pack = self.record.pack
+        keys = self.keys
+        self.file.write(b''.join(
+            pack(int(timestamp), *[reading[key] for key in keys]) for timestamp, reading in records
+        ))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class CsvSink(TelemetrySink):
+    '''timestamp와 센서 항목을 열로 하는 CSV로 기록 (새 파일이면 머리글 줄을 먼저 씀)'''
+
+    def __init__(self, path, keys):
+        self.keys = list(keys)
+        self.file = open(path, 'a', encoding='utf-8', newline='')
+        if self.file.tell() == 0:
+            csv.writer(self.file).writerow(['timestamp'] + self.keys)
+
+    def write_batch(self, records):
+        # 배치 전체를 메모리에서 만든 뒤 한 번에 쓴다.
+        buffer = io.StringIO()
+        keys = self.keys
+        csv.writer(buffer).writerows(
+            [timestamp] + [reading[key] for key in keys] for timestamp, reading in records
+        )
+        self.file.write(buffer.getvalue())
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class CallbackSink(TelemetrySink):
+    '''같은 프로세스 안의 함수 callback(records)에 배치를 그대로 넘김'''
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write_batch(self, records):
+        self.callback(records)
+
+
+class SinkWorker:
+    '''
+    싱크 하나를 전담하는 백그라운드 스레드와 크기가 제한된 큐
+    큐가 가득 차면 가장 오래된 측정값을 버리고 dropped에 센다.
+    그래서 싱크가 느리거나 멈춰도 put()은 기다리지 않고 바로 돌아온다.
+    '''
+
+    def __init__(self, sink, batch_size=BATCH_SIZE, queue_size=QUEUE_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = deque(maxlen=queue_size)
+        self.condition = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def put(self, record):
+        with self.condition:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1  # deque(maxlen)이 가장 오래된 값을 밀어낸다.
+            self.queue.append(record)
+            if len(self.queue) >= self.batch_size:
+                self.condition.notify()
+
+    def _take_batch(self):
+        with self.condition:
+            deadline = time.monotonic() + self.flush_interval
+            while not self.closed and len(self.queue) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            count = min(len(self.queue), self.batch_size)
+            return [self.queue.popleft() for _ in range(count)], self.closed
+
+    def _run(self):
+        while True:
+            batch, closed = self._take_batch()
+            if batch:
+                try:
+                    self.sink.write_batch(batch)
+                    self.sink.flush()
+                    self.written += len(batch)
+                except Exception as e:
+                    self.errors += 1
+                    print(f'텔레메트리 싱크 오류 ({type(self.sink).__name__}): {e}')
+            elif closed:
+                return
+
+    def close(self):
+        '''큐에 남은 값을 모두 내보낸 뒤 스레드와 싱크를 닫음'''
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+        self.sink.close()
+
+    def stats(self):
+        return {
+            'sink': type(self.sink).__name__,
+            'queued': len(self.queue),
+            'written': self.written,
+            'dropped': self.dropped,
+            'errors': self.errors,
+        }
+
+
+class TelemetryPipeline:
+    '''측정값 하나를 등록된 모든 싱크의 큐로 나눠 주는 분배기'''
+
+    def __init__(self):
+        self.workers = []
+
+    def add_sink(self, sink, **options):
+        '''options는 SinkWorker의 batch_size, queue_size, flush_interval'''
+        self.workers.append(SinkWorker(sink, **options))
+
+    def emit(self, timestamp, reading):
+        # 센서가 같은 dict를 계속 고쳐 쓰므로 큐에 넣기 전에 복사해 둔다.
+        record = (timestamp, dict(reading))
+        for worker in self.workers:
+            worker.put(record)
+
+    def stats(self):
+        return [worker.stats() for worker in self.workers]
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+        self.workers = []